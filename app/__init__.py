@@ -11,6 +11,8 @@ from .courses.routes import courses_bp
 from .enrollments.routes import enroll_bp
 from .exams.routes import exam_bp
 from .schedules.routes import schedule_bp
+from .analytics.routes import analytics_bp
+from .api.routes import api_bp
 from .extensions import db, migrate, login_manager, csrf, mail
 def create_app():
     app = Flask(__name__, instance_relative_config=True)
@@ -21,7 +23,10 @@ def create_app():
     except OSError:
         pass
 
+    from .utils.db_engine import engine_options, init_sqlite_pragmas
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
     db.init_app(app)
+    init_sqlite_pragmas(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     csrf.init_app(app)
@@ -33,9 +38,32 @@ def create_app():
     app.register_blueprint(enroll_bp, url_prefix="/enrollments")
     app.register_blueprint(exam_bp, url_prefix="/exams")
     app.register_blueprint(schedule_bp, url_prefix="/schedules")
+    app.register_blueprint(analytics_bp, url_prefix="/analytics")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
+
+    from .utils.query_count import init_query_stats
+    init_query_stats(app)
+    from .utils.metrics import init_metrics
+    init_metrics(app)
 
     from .seed import register_seed_command
     register_seed_command(app)
+    from .seed_bulk import register_seed_bulk_command
+    register_seed_bulk_command(app)
+    from .utils.mail_queue import register_mail_worker_command
+    register_mail_worker_command(app)
+    from .utils.gpa import register_gpa_commands
+    register_gpa_commands(app)
+    from .utils.search import register_search_commands
+    register_search_commands(app)
+    from .utils.transcripts import register_transcript_commands
+    register_transcript_commands(app)
+    from .utils.passwords import register_password_commands
+    register_password_commands(app)
+    from .utils.exam_scheduler import register_exam_commands
+    register_exam_commands(app)
+    from .utils.standing import register_standing_commands
+    register_standing_commands(app)
    # === Inject biến global cho Jinja2 ===
     @app.context_processor
     def inject_globals():
@@ -0,0 +1,90 @@
+from functools import wraps
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask_login import login_required, current_user
+from app.models import Role
+from app.utils.analytics import cohort_report, ranking, class_summary, course_stats, with_names
+
+analytics_bp = Blueprint("analytics", __name__, template_folder="../templates")
+
+VIEWS = {
+    "students": lambda report, semester, class_name: ranking(report, semester, class_name),
+    "classes": lambda report, semester, class_name: class_summary(report, semester),
+    "courses": lambda report, semester, class_name: course_stats(report, semester),
+}
+
+
+def require_role(*roles):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_user.is_anonymous or current_user.role not in roles:
+                flash("⚠️ Bạn không có quyền truy cập trang này!", "warning")
+                return redirect(url_for("main.index"))
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _filters():
+    semester = request.args.get("semester", "").strip() or None
+    class_name = request.args.get("class_name", "").strip() or None
+    limit = request.args.get("limit", type=int) or current_app.config["PAGE_SIZE"]
+    limit = max(1, min(limit, current_app.config["MAX_PAGE_SIZE"]))
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    return semester, class_name, limit, offset
+
+
+# ==========================
+# 📊 Trang thống kê học tập (Admin)
+# ==========================
+@analytics_bp.route("/")
+@login_required
+@require_role(Role.ADMIN)
+def index():
+    report = cohort_report()
+    semester, class_name, limit, _ = _filters()
+    if semester and semester not in report.semesters:
+        flash(f"⚠️ Không có dữ liệu điểm của học kỳ {semester}.", "warning")
+        semester = None
+
+    classes = class_summary(report, semester)
+    students = with_names(ranking(report, semester, class_name).head(limit).to_dict("records")) \
+        if class_name else []
+    courses = with_names(course_stats(report, semester).head(limit).to_dict("records"))
+    return render_template(
+        "analytics/index.html",
+        report=report,
+        semester=semester,
+        class_name=class_name,
+        classes=classes.head(limit).to_dict("records"),
+        class_count=len(classes),
+        students=students,
+        courses=courses,
+    )
+
+
+# ==========================
+# 🔌 JSON cho công cụ báo cáo
+# ==========================
+@analytics_bp.route("/data.json")
+@login_required
+def data():
+    """?view=students|classes|courses&semester=&class_name=&limit=&offset="""
+    if current_user.role != Role.ADMIN:
+        return jsonify({"error": "forbidden"}), 403
+    view = request.args.get("view", "students")
+    if view not in VIEWS:
+        return jsonify({"error": f"view phải là một trong: {', '.join(VIEWS)}"}), 400
+
+    report = cohort_report()
+    semester, class_name, limit, offset = _filters()
+    df = VIEWS[view](report, semester, class_name)
+    return jsonify({
+        "view": view,
+        "semester": semester,
+        "class_name": class_name,
+        "total": len(df),
+        "offset": offset,
+        "items": with_names(df.iloc[offset:offset + limit].to_dict("records")),
+        "computed_in": report.seconds,
+    })
@@ -0,0 +1,297 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from flask import Blueprint, request, jsonify, current_app
+from flask_login import login_required, current_user
+from sqlalchemy.exc import DataError, IntegrityError
+from app.extensions import db, csrf
+from app.models import Student, Course, Enrollment, Exam, Schedule, Role
+from app.utils.pagination import page_args
+from app.utils.grade_import import import_grades
+from app.utils.mail_queue import queue_grade_notifications
+from app.utils.metrics import BATCH_SECONDS_PER_1K
+
+api_bp = Blueprint("api", __name__)
+
+
+# ==========================
+# 📚 Tài nguyên chỉ đọc
+# ==========================
+@dataclass(frozen=True)
+class Resource:
+    model: type
+    fields: tuple         # cột được phép trả về / chọn qua ?fields=
+    filters: tuple = ()   # cột lọc bằng so sánh bằng (?class_name=DTS1)
+
+
+RESOURCES = {
+    "students": Resource(Student, ("id", "code", "full_name", "email", "class_name", "created_at", "updated_at"),
+                         ("code", "class_name")),
+    "courses": Resource(Course, ("id", "code", "name", "credits", "created_at", "updated_at"), ("code",)),
+    "enrollments": Resource(Enrollment, ("id", "student_id", "course_id", "semester", "grade",
+                                         "created_at", "updated_at"),
+                            ("student_id", "course_id", "semester")),
+    "exams": Resource(Exam, ("id", "course_id", "date", "start_minute", "room", "note", "updated_at"),
+                      ("course_id", "room")),
+    "schedules": Resource(Schedule, ("id", "course_id", "weekday", "start_minute", "end_minute", "room",
+                                     "updated_at"),
+                          ("course_id", "weekday", "room")),
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@api_bp.errorhandler(ApiError)
+def _api_error(e):
+    return jsonify({"error": str(e)}), e.status
+
+
+@api_bp.errorhandler(401)
+def _unauthorized(e):
+    return jsonify({"error": "unauthorized"}), 401
+
+
+# ==========================
+# 🔧 fields= / bộ lọc / phạm vi theo vai trò
+# ==========================
+def _selected_fields(resource):
+    """?fields=code,full_name -> chỉ SELECT các cột đó (id luôn có: dùng làm con trỏ trang)"""
+    raw = request.args.get("fields", "").strip()
+    if not raw:
+        return resource.fields
+    names = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in names if f not in resource.fields]
+    if unknown:
+        raise ApiError(f"fields không hợp lệ: {', '.join(unknown)} (cho phép: {', '.join(resource.fields)})")
+    return tuple(dict.fromkeys(["id", *names]))
+
+
+def _conditions(resource):
+    model = resource.model
+    conditions = []
+    for name in resource.filters:
+        if name in request.args:
+            column = model.__table__.c[name]
+            value = request.args.get(name, type=int if isinstance(column.type, db.Integer) else str)
+            if value is None:
+                raise ApiError(f"{name} phải là số nguyên")
+            conditions.append(column == value)
+    # Sinh viên chỉ thấy hồ sơ / điểm của chính mình (như trang xuất điểm)
+    if current_user.role == Role.STUDENT:
+        if model is Student:
+            conditions.append(Student.id == current_user.student_id)
+        elif model is Enrollment:
+            conditions.append(Enrollment.student_id == current_user.student_id)
+    return conditions
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+# ==========================
+# 🏷️ ETag / Last-Modified
+# ==========================
+def _etag(rows):
+    """
+    ETag từ (id, updated_at) của đúng các dòng trả về + query string (fields, bộ lọc, trang):
+    sửa, thêm hay xóa một dòng trong trang đều đổi ETag.
+    """
+    digest = hashlib.sha1(request.query_string)
+    for r in rows:
+        stamp = r._mapping["_stamp"] or r._mapping.get("_created")
+        digest.update(f"{r.id}:{stamp.isoformat() if stamp else ''};".encode())
+    return digest.hexdigest()
+
+
+def _last_modified(row):
+    """
+    Last-Modified (chỉ cho một bản ghi) làm tròn lên giây, và chỉ gửi khi updated_at đã cũ hơn 1 giây:
+    một lần sửa sau đó chắc chắn mới hơn giá trị client gửi lại trong If-Modified-Since.
+    """
+    stamp = row._mapping["_stamp"] or row._mapping.get("_created")
+    if stamp is None or datetime.utcnow() - stamp < timedelta(seconds=1):
+        return None, stamp
+    ceiled = stamp.replace(microsecond=0) + timedelta(seconds=1 if stamp.microsecond else 0)
+    return ceiled.replace(tzinfo=timezone.utc), stamp
+
+
+def _respond(payload, rows, single=False):
+    """
+    304 trước khi dựng JSON nếu client đã có đúng bản này.
+    Danh sách chỉ dùng ETag: xóa dòng mới nhất làm max(updated_at) giảm nên không dùng được Last-Modified.
+    """
+    etag = _etag(rows)
+    last_modified, stamp = _last_modified(rows[0]) if single else (None, None)
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        not_modified = (single and since is not None and stamp is not None
+                        and stamp.replace(tzinfo=timezone.utc) <= since)
+
+    response = current_app.response_class(status=304) if not_modified else jsonify(payload())
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Client luôn hỏi lại server (If-None-Match) thay vì dùng bản cache cũ
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _select(resource, names):
+    table = resource.model.__table__
+    columns = [table.c[n] for n in names] + [table.c.updated_at.label("_stamp")]
+    if "created_at" in table.c:
+        columns.append(table.c.created_at.label("_created"))
+    return db.select(*columns)
+
+
+def _resource(name):
+    resource = RESOURCES.get(name)
+    if resource is None:
+        raise ApiError(f"Không có tài nguyên '{name}' (có: {', '.join(RESOURCES)})", 404)
+    return resource
+
+
+# ==========================
+# ⬆️ POST /api/v1/enrollments:batch
+# ==========================
+def _batch_body():
+    """Đọc thân request, dừng ngay khi vượt API_BATCH_MAX_BYTES (trước khi parse JSON)"""
+    limit = current_app.config["API_BATCH_MAX_BYTES"]
+    too_large = ApiError(f"Thân request tối đa {limit} byte", 413)
+    if request.content_length is not None and request.content_length > limit:
+        raise too_large
+    raw = request.stream.read(limit + 1)
+    if len(raw) > limit:
+        raise too_large
+    try:
+        return raw.decode(request.mimetype_params.get("charset", "utf-8"))
+    except (LookupError, UnicodeDecodeError):
+        raise ApiError("Thân request không phải UTF-8 hợp lệ")
+
+
+def _batch_records():
+    """Thân request: JSON (mảng hoặc {"records": [...]}) hoặc NDJSON (mỗi dòng một bản ghi)"""
+    mimetype = request.mimetype
+    if mimetype == "application/json":
+        try:
+            body = json.loads(_batch_body())
+        except ValueError:
+            raise ApiError("JSON không hợp lệ")
+        records = body.get("records") if isinstance(body, dict) else body
+        if not isinstance(records, list):
+            raise ApiError('Cần một mảng bản ghi hoặc {"records": [...]}')
+    elif mimetype in ("application/x-ndjson", "application/ndjson"):
+        records = []
+        for no, line in enumerate(_batch_body().splitlines(), start=1):
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    raise ApiError(f"Dòng {no}: JSON không hợp lệ")
+    else:
+        # Chỉ nhận kiểu cần preflight CORS: trang web khác không gửi được bằng cookie đăng nhập
+        raise ApiError("Content-Type phải là application/json hoặc application/x-ndjson", 415)
+
+    if len(records) > current_app.config["API_BATCH_MAX_RECORDS"]:
+        raise ApiError(f"Tối đa {current_app.config['API_BATCH_MAX_RECORDS']} bản ghi mỗi request", 413)
+    if not all(isinstance(r, dict) for r in records):
+        raise ApiError("Mỗi bản ghi phải là object {student_code, course_code, semester, grade}")
+    return records
+
+
+@api_bp.route("/enrollments:batch", methods=["POST"])
+@csrf.exempt
+@login_required
+def enrollments_batch():
+    """
+    Ghi danh / nhập điểm hàng loạt trong một transaction (?dry_run=1: chỉ kiểm tra).
+    Email điểm vào hàng đợi cùng transaction thay vì gửi ngay.
+    """
+    if current_user.role not in (Role.ADMIN, Role.TEACHER):
+        raise ApiError("forbidden", 403)
+    records = _batch_records()
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true")
+
+    t0 = time.perf_counter()
+    queued = 0
+    try:
+        report = import_grades(records, commit=False, first_row=0, record_metrics=not dry_run)
+        if dry_run:
+            db.session.rollback()
+        else:
+            queued = queue_grade_notifications(report.notifications)
+            db.session.commit()
+    except IntegrityError:
+        # Một request khác vừa ghi danh cùng (SV, HP, học kỳ): cả lô được hoàn tác, client gửi lại
+        db.session.rollback()
+        raise ApiError("Xung đột ghi đồng thời, không bản ghi nào được lưu; hãy gửi lại", 409)
+    except DataError as ex:
+        # Giá trị DB từ chối (quá dài / sai kiểu) dù đã kiểm tra từng bản ghi: trả 400 thay vì 500
+        db.session.rollback()
+        raise ApiError(f"Dữ liệu không hợp lệ, không bản ghi nào được lưu: {ex.orig}")
+    elapsed = time.perf_counter() - t0
+    per_1k = elapsed * 1000 / max(len(records), 1)
+    if records and not dry_run:
+        BATCH_SECONDS_PER_1K.observe(per_1k)
+
+    return jsonify({
+        "dry_run": dry_run,
+        "inserted": report.inserted,
+        "updated": report.updated,
+        "skipped": report.skipped,
+        "notifications_queued": queued,
+        "results": [{"index": r.row, "status": r.status, **({"reason": r.reason} if r.reason else {})}
+                    for r in report.rows],
+        "timing": {"records": len(records), "ms": round(elapsed * 1000, 1), "ms_per_1k": round(per_1k * 1000, 1)},
+    })
+
+
+# ==========================
+# 📄 GET /api/v1/<tài nguyên>?fields=&after=&limit=&<bộ lọc>
+# ==========================
+@api_bp.route("/<name>")
+@login_required
+def list_resource(name):
+    resource = _resource(name)
+    names = _selected_fields(resource)
+    after, limit = page_args()
+    table = resource.model.__table__
+
+    stmt = _select(resource, names).where(*_conditions(resource))
+    if after is not None:
+        stmt = stmt.where(table.c.id > after)
+    rows = db.session.execute(stmt.order_by(table.c.id).limit(limit + 1)).all()
+
+    def payload():
+        page = rows[:limit]
+        return {
+            "items": [{n: _json_value(getattr(r, n)) for n in names} for r in page],
+            "limit": limit,
+            "after": after,
+            "next_after": page[-1].id if len(rows) > limit else None,
+        }
+
+    return _respond(payload, rows)
+
+
+@api_bp.route("/<name>/<int:id>")
+@login_required
+def get_resource(name, id):
+    resource = _resource(name)
+    names = _selected_fields(resource)
+    table = resource.model.__table__
+    row = db.session.execute(
+        _select(resource, names).where(table.c.id == id, *_conditions(resource))
+    ).first()
+    if row is None:
+        raise ApiError("Không tìm thấy", 404)
+    return _respond(lambda: {n: _json_value(getattr(row, n)) for n in names}, [row], single=True)
@@ -2,7 +2,8 @@ from flask import render_template, redirect, url_for, flash
 from flask_login import login_user, logout_user
 from app.models import User
 from .forms import LoginForm  # 🟢 import form mới
-from app.extensions import csrf
+from app.extensions import csrf, db
+from app.utils.passwords import PasswordHashBusy
 
 from . import auth_bp
 
@@ -14,7 +15,17 @@ def login():
         password = form.password.data
         user = User.query.filter_by(email=email).first()
 
-        if user and user.check_password(password):
+        try:
+            ok = user is not None and user.check_password(password)
+            # Tham số băm đã đổi: lưu lại hash mới khi đang có mật khẩu gốc
+            if ok and user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
+        except PasswordHashBusy:
+            flash("⏳ Hệ thống đang bận, vui lòng thử đăng nhập lại sau giây lát.", "warning")
+            return render_template("auth/login.html", form=form), 503
+
+        if ok:
             login_user(user)
             flash("Đăng nhập thành công!", "success")
             return redirect(url_for("main.index"))
@@ -9,6 +9,13 @@ class Config:
     # ========= 🔐 Cấu hình bảo mật =========
     SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key")
 
+    # ========= 🔑 Băm mật khẩu (xem app/utils/passwords.py) =========
+    # Đổi tham số -> hash cũ được băm lại khi người dùng đăng nhập thành công
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 16))  # số yêu cầu được chờ
+    PASSWORD_HASH_WAIT_SECONDS = float(os.getenv("PASSWORD_HASH_WAIT_SECONDS", 2))
+
     # ========= 🗄️ Cấu hình Database =========
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "SQLALCHEMY_DATABASE_URI",
@@ -16,6 +23,18 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # ========= 🏊 Engine / pool kết nối (xem app/utils/db_engine.py) =========
+    # SQLite: áp dụng bằng PRAGMA khi mở kết nối
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    # MySQL / PostgreSQL: pool của mỗi tiến trình (tổng = số worker x (size + overflow))
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # giây chờ kết nối rảnh
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # < wait_timeout của MySQL
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() in ["true", "1", "t"]
+
     # ========= 📧 Cấu hình Email (Flask-Mail) =========
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
@@ -24,5 +43,44 @@ class Config:
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")  # App password (16 ký tự)
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", MAIL_USERNAME)
 
+    # ========= 📨 Hàng đợi email (flask mail-worker) =========
+    MAIL_QUEUE_BATCH_SIZE = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 200))
+    MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("MAIL_QUEUE_MAX_ATTEMPTS", 5))
+    MAIL_QUEUE_BACKOFF_SECONDS = int(os.getenv("MAIL_QUEUE_BACKOFF_SECONDS", 30))
+    MAIL_QUEUE_POLL_SECONDS = int(os.getenv("MAIL_QUEUE_POLL_SECONDS", 5))
+
+    # ========= 📄 Phân trang =========
+    PAGE_SIZE = int(os.getenv("PAGE_SIZE", 50))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+    # ========= 🔌 JSON API (/api/v1) =========
+    API_BATCH_MAX_RECORDS = int(os.getenv("API_BATCH_MAX_RECORDS", 20000))  # mỗi request enrollments:batch
+    API_BATCH_MAX_BYTES = int(os.getenv("API_BATCH_MAX_BYTES", 4 * 1024 * 1024))  # kiểm tra trước khi parse thân request
+
+    # ========= ⏱️ Cache =========
+    DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 60))  # giây
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))  # giây; 0 = tắt cache user_loader
+    TIMETABLE_CACHE_TTL = int(os.getenv("TIMETABLE_CACHE_TTL", 300))  # giây; 0 = tắt cache TKB cá nhân
+    ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 600))  # giây; 0 = tính lại thống kê mỗi lần xem
+
+    # ========= 🐢 Theo dõi SQL / request chậm =========
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 500))
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", 100))
+    SQL_DEBUG_FOOTER = os.getenv("SQL_DEBUG_FOOTER", "False").lower() in ["true", "1", "t"]
+
+    # ========= 📝 Xếp lịch thi tự động (flask schedule-exams, /exams/auto) =========
+    EXAM_ROOMS = os.getenv("EXAM_ROOMS", "")  # "A101:40,A102:40,B201:120" (tên:sức chứa)
+    EXAM_SESSIONS = os.getenv("EXAM_SESSIONS", "07:30,09:45,13:00,15:15")  # giờ bắt đầu các ca
+
+    # ========= 🎓 Xếp loại học kỳ (flask compute-standing) =========
+    STANDING_PROBATION_GPA = float(os.getenv("STANDING_PROBATION_GPA", 2.0))  # GPA tích lũy dưới ngưỡng -> cảnh báo
+    STANDING_PROBATION_TERM_GPA = float(os.getenv("STANDING_PROBATION_TERM_GPA", 1.0))  # hoặc GPA học kỳ dưới ngưỡng
+    STANDING_DEANS_LIST_GPA = float(os.getenv("STANDING_DEANS_LIST_GPA", 3.6))
+    STANDING_DEANS_LIST_MIN_CREDITS = int(os.getenv("STANDING_DEANS_LIST_MIN_CREDITS", 12))  # tín chỉ có điểm trong kỳ
+
+    # ========= 📄 Cache bảng điểm PDF (mặc định instance/transcripts) =========
+    TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR")
+    TRANSCRIPT_CACHE_KEEP_SECONDS = int(os.getenv("TRANSCRIPT_CACHE_KEEP_SECONDS", 3600))  # giữ bản cũ (hash khác) tối thiểu
+
     # ========= 🧩 CSRF =========
     WTF_CSRF_ENABLED = True
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from ..extensions import db, csrf
 from ..models import Course, Role
+from ..utils.pagination import keyset_paginate
 
 courses_bp = Blueprint("courses", __name__, template_folder="../templates/courses")
 
@@ -32,8 +33,8 @@ def index():
     if q:
         like = f"%{q}%"
         query = query.filter((Course.name.ilike(like)) | (Course.code.ilike(like)))
-    courses = query.order_by(Course.id.desc()).all()
-    return render_template("courses/index.html", courses=courses, q=q)
+    page = keyset_paginate(query, Course.id)
+    return render_template("courses/index.html", courses=page.items, page=page, q=q)
 
 
 # ==============================
@@ -1,12 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, abort
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, abort, Response, stream_with_context
 from flask_login import login_required, current_user
-from io import BytesIO
-import pandas as pd
+import tempfile
 from functools import wraps
+from sqlalchemy.orm import joinedload
 from ..extensions import db
 from ..models import Enrollment, Student, Course, Role
-from ..utils.pdf import build_transcript_pdf
-from ..utils.email_utils import send_grade_notification  # ✅ Gửi email tự động
+from ..utils.transcripts import transcript_file
+from ..utils.mail_queue import queue_grade_notification, queue_grade_notifications  # ✅ Email qua hàng đợi
+from ..utils.grade_import import import_grades
+from ..utils.pagination import keyset_paginate
+from ..utils.grade_export import iter_grade_rows, write_grades_xlsx, iter_grades_csv
 
 enroll_bp = Blueprint("enrollments", __name__, template_folder="../templates/enrollments")
 
@@ -32,8 +35,10 @@ def require_role(*roles):
 @enroll_bp.route("/")
 @login_required
 def index():
-    enrolls = Enrollment.query.order_by(Enrollment.id.desc()).limit(200).all()
-    return render_template("enrollments/index.html", enrolls=enrolls)
+    # JOIN sẵn student/course: 1 truy vấn cho cả trang thay vì 2 truy vấn mỗi dòng
+    query = Enrollment.query.options(joinedload(Enrollment.student), joinedload(Enrollment.course))
+    page = keyset_paginate(query, Enrollment.id)
+    return render_template("enrollments/index.html", enrolls=page.items, page=page)
 
 
 # ==============================
@@ -56,16 +61,15 @@ def assign():
         e = Enrollment(student_id=student_id, course_id=course_id, semester=semester, grade=grade)
         db.session.add(e)
         try:
-            db.session.commit()
-            flash("✅ Đã ghi danh/nhập điểm thành công.", "success")
-
-            # 📨 Gửi email tự động nếu có điểm
+            # 📨 Xếp email thông báo vào hàng đợi, commit cùng bản ghi điểm
             if grade is not None:
                 student = Student.query.get(student_id)
                 course = Course.query.get(course_id)
-                if student and student.email:
-                    send_grade_notification(student.email, course.name, grade)
+                if student and course:
+                    queue_grade_notification(student.email, course.name, grade)
 
+            db.session.commit()
+            flash("✅ Đã ghi danh/nhập điểm thành công.", "success")
         except Exception as ex:
             db.session.rollback()
             flash(f"❌ Lỗi khi lưu dữ liệu: {ex}", "danger")
@@ -88,6 +92,7 @@ def upload():
             flash("⚠️ Chưa chọn file!", "danger")
             return render_template("enrollments/upload.html")
         try:
+            import pandas as pd  # Nạp khi cần: chỉ trang import mới dùng pandas
             df = pd.read_excel(file)
             required = {"student_code", "course_code", "semester", "grade"}
             colmap = {c: c.lower() for c in df.columns if str(c).lower() in required}
@@ -97,29 +102,21 @@ def upload():
                 flash("Thiếu cột: " + ", ".join(sorted(missing)), "danger")
                 return render_template("enrollments/upload.html")
 
-            inserts = 0
-            for _, row in df.iterrows():
-                s = Student.query.filter_by(code=str(row['student_code']).strip()).first()
-                c = Course.query.filter_by(code=str(row['course_code']).strip()).first()
-                if not s or not c:
-                    continue
-                try:
-                    grade = float(row['grade']) if pd.notna(row['grade']) else None
-                except:
-                    grade = None
-                e = Enrollment(student_id=s.id, course_id=c.id, semester=str(row['semester']).strip(), grade=grade)
-                db.session.add(e)
-                try:
-                    db.session.commit()
-                    inserts += 1
-                    if grade is not None and s.email:
-                        send_grade_notification(s.email, c.name, grade)
-                except:
-                    db.session.rollback()
-
-            flash(f"✅ Đã xử lý xong file. {inserts} bản ghi được thêm!", "success")
-            return redirect(url_for("enrollments.index"))
+            records = df[sorted(required)].to_dict("records")
+            report = import_grades(records, commit=False)
+
+            # 📨 Email thông báo đi vào hàng đợi trong cùng transaction
+            queue_grade_notifications(report.notifications)
+            db.session.commit()
+
+            flash(
+                f"✅ Đã xử lý xong file. {report.inserted} bản ghi được thêm, "
+                f"{report.updated} cập nhật, {report.skipped} bỏ qua.",
+                "success",
+            )
+            return render_template("enrollments/upload.html", report=report)
         except Exception as ex:
+            db.session.rollback()
             flash(f"❌ Lỗi đọc file: {ex}", "danger")
             return render_template("enrollments/upload.html")
 
@@ -133,29 +130,26 @@ def upload():
 @login_required
 def export_excel():
     # ✅ Cho phép tất cả role, nhưng nếu là sinh viên thì chỉ export điểm của họ
-    data = []
+    # (tài khoản sinh viên chưa gắn hồ sơ SV -> file rỗng, không phải toàn trường)
     if current_user.role == Role.STUDENT:
-        enrolls = Enrollment.query.filter_by(student_id=current_user.student_id).all()
+        rows = iter_grade_rows(current_user.student_id)
     else:
-        enrolls = Enrollment.query.all()
-
-    for e in enrolls:
-        data.append({
-            "student_code": e.student.code,
-            "student_name": e.student.full_name,
-            "course_code": e.course.code,
-            "course_name": e.course.name,
-            "credits": e.course.credits,
-            "semester": e.semester,
-            "grade": e.grade,
-        })
-    df = pd.DataFrame(data)
-    bio = BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="grades")
-    bio.seek(0)
+        rows = iter_grade_rows(all_students=True)
+
+    # CSV: stream từng đoạn, bộ nhớ không phụ thuộc số dòng
+    if request.args.get("format") == "csv":
+        return Response(
+            stream_with_context(iter_grades_csv(rows)),
+            mimetype="text/csv",
+            headers={"Content-Disposition": "attachment; filename=grades_export.csv"},
+        )
+
+    # Excel: ghi write-only ra file tạm trên đĩa rồi gửi file đó
+    tmp = tempfile.TemporaryFile()
+    write_grades_xlsx(rows, tmp)
+    tmp.seek(0)
     return send_file(
-        bio,
+        tmp,
         as_attachment=True,
         download_name="grades_export.xlsx",
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
@@ -170,9 +164,9 @@ def export_excel():
 def transcript_pdf(student_id):
     if current_user.role not in (Role.ADMIN, Role.TEACHER) and current_user.student_id != student_id:
         abort(403)
-    pdf_bytes, filename = build_transcript_pdf(student_id)
+    pdf, filename = transcript_file(student_id)
     return send_file(
-        BytesIO(pdf_bytes),
+        pdf,
         as_attachment=True,
         download_name=filename,
         mimetype="application/pdf"
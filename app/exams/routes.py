@@ -1,9 +1,28 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from app.models import Exam, Course
+from datetime import date as date_cls
+from functools import wraps
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask_login import login_required, current_user
+from app.models import Exam, Course, Role
 from app.extensions import db, csrf
+from app.utils.timeslots import parse_clock, current_semester
+from app.utils.exam_scheduler import (ExamScheduleError, parse_rooms, parse_sessions,
+                                      plan_exams, save_plan)
 
 exam_bp = Blueprint("exams", __name__, template_folder="../templates")
 
+
+def require_role(*roles):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_user.is_anonymous or current_user.role not in roles:
+                flash("⚠️ Bạn không có quyền truy cập trang này!", "warning")
+                return redirect(url_for("main.index"))
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 @exam_bp.route("/")
 def index():
     exams = Exam.query.all()
@@ -16,9 +35,54 @@ def create():
         date = request.form["date"]
         room = request.form["room"]
         course_id = request.form["course_id"]
-        exam = Exam(course_id=course_id, date=date, room=room)
+        exam = Exam(course_id=course_id, date=date_cls.fromisoformat(date), room=room,
+                    start_minute=parse_clock(request.form.get("start_time")),
+                    note=request.form.get("note") or None)
         db.session.add(exam)
         db.session.commit()
         flash("Đã tạo lịch thi!", "success")
-        return redirect(url_for("exams.index"))
+        return redirect(url_for("main.exams"))
     return render_template("exams/form.html", courses=courses)
+
+
+# === Tự động xếp lịch thi cả học kỳ (Admin) ===
+@exam_bp.route("/auto", methods=["GET", "POST"])
+@login_required
+@require_role(Role.ADMIN)
+def auto():
+    form = {
+        "semester": current_semester() or "",
+        "start": "",
+        "rooms": current_app.config["EXAM_ROOMS"].replace(",", "\n"),
+        "sessions": current_app.config["EXAM_SESSIONS"],
+        "note": "Cuối kỳ",
+    }
+    if request.method == "GET":
+        return render_template("exams/auto.html", form=form, plan=None)
+
+    form.update({k: request.form.get(k, "").strip() for k in form})
+    try:
+        start = date_cls.fromisoformat(form["start"])
+    except ValueError:
+        flash("❌ Ngày thi đầu tiên không hợp lệ!", "danger")
+        return render_template("exams/auto.html", form=form, plan=None)
+    try:
+        plan = plan_exams(form["semester"], start, parse_rooms(form["rooms"]),
+                          parse_sessions(form["sessions"]))
+    except ExamScheduleError as e:
+        flash(f"❌ {e}", "danger")
+        return render_template("exams/auto.html", form=form, plan=None)
+
+    if not plan.slots:
+        flash(f"⚠️ Học kỳ {form['semester']} chưa có ghi danh nào.", "warning")
+        return render_template("exams/auto.html", form=form, plan=None)
+
+    if request.form.get("action") == "save":
+        count = save_plan(plan, form["note"] or None)
+        flash(f"✅ Đã xếp {plan.courses} học phần vào {len(plan.slots)} ca thi "
+              f"({plan.days} ngày, {count} phòng thi).", "success")
+        return redirect(url_for("main.exams"))
+
+    ids = [cid for _, _, items in plan.slots for cid, _, _ in items]
+    codes = dict(db.session.query(Course.id, Course.code).filter(Course.id.in_(ids)))
+    return render_template("exams/auto.html", form=form, plan=plan, codes=codes)
@@ -10,6 +10,7 @@ login_manager = LoginManager()
 csrf = CSRFProtect()
 
 login_manager.login_view = "auth.login"
+login_manager.blueprint_login_views = {"api": None}  # /api/v1: trả 401 thay vì chuyển tới trang đăng nhập
 login_manager.login_message_category = "warning"
 
 mail = Mail()
@@ -1,21 +1,26 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
 from flask_login import login_required, current_user
-from ..models import Student, Course, Enrollment, Exam, Schedule, compute_student_gpa
+from sqlalchemy.orm import joinedload
+from ..models import Student, Course, Enrollment, Exam, Schedule, Role, get_student_gpa
 from ..extensions import db
+from ..utils.cache import TTLCache, invalidate_on_commit
+from ..utils.timetable import student_timetable
 
 # ==============================
 # 📊 Khởi tạo Blueprint chính
 # ==============================
 main_bp = Blueprint("main", __name__, template_folder="../templates/main")
 
+# Số liệu dashboard: cache theo TTL, xóa ngay khi có ghi vào các bảng liên quan
+dashboard_cache = TTLCache("dashboard")
+invalidate_on_commit(dashboard_cache, Student, Course, Enrollment)
+
 
 # ==============================
-# 📈 Trang Dashboard chính
+# 🧮 Số liệu tổng hợp cho Dashboard
 # ==============================
-@main_bp.route("/")
-@login_required
-def index():
-    """Trang bảng điều khiển tổng quan"""
+def _dashboard_stats():
+    """Các số liệu tổng hợp dùng chung cho mọi người dùng (được cache)"""
 
     # --- Thống kê tổng quan ---
     total_students = Student.query.count()
@@ -31,9 +36,6 @@ def index():
         ORDER BY g
     """)).all()
 
-    labels = [str(int(r.g)) for r in grade_rows]
-    values = [int(r.c) for r in grade_rows]
-
     # --- Top 5 học phần được đăng ký nhiều nhất ---
     top_courses = db.session.execute(db.text("""
         SELECT course.name, COUNT(enrollment.id) as cnt
@@ -44,41 +46,79 @@ def index():
         LIMIT 5
     """)).all()
 
+    return {
+        "total_students": total_students,
+        "total_courses": total_courses,
+        "total_enrolls": total_enrolls,
+        "labels": [str(int(r.g)) for r in grade_rows],
+        "values": [int(r.c) for r in grade_rows],
+        "top_courses": [{"name": r.name, "cnt": r.cnt} for r in top_courses],
+    }
+
+
+# ==============================
+# 📈 Trang Dashboard chính
+# ==============================
+@main_bp.route("/")
+@login_required
+def index():
+    """Trang bảng điều khiển tổng quan"""
+
+    stats = dashboard_cache.get_or_set(
+        "stats", _dashboard_stats, ttl=current_app.config["DASHBOARD_CACHE_TTL"]
+    )
+
     # --- GPA cá nhân (nếu là sinh viên) ---
     gpa_info = None
     if current_user.is_authenticated and current_user.student_id:
-        gpa, credits = compute_student_gpa(current_user.student_id)
+        gpa, credits = get_student_gpa(current_user.student_id)
         gpa_info = {"gpa": gpa, "credits": credits}
 
     # --- Lịch thi gần nhất ---
-    exams = Exam.query.order_by(Exam.date.asc()).limit(5).all()
+    exams = Exam.query.options(joinedload(Exam.course)) \
+        .order_by(Exam.date.asc(), Exam.start_minute.asc()).limit(5).all()
 
-    # --- Thời khóa biểu ---
-    schedules = Schedule.query.order_by(Schedule.weekday).limit(5).all()
+    # --- Thời khóa biểu (sinh viên: TKB cá nhân) ---
+    if current_user.role == Role.STUDENT and current_user.student_id:
+        schedules = student_timetable(current_user.student_id).entries[:5]
+    else:
+        schedules = Schedule.query.options(joinedload(Schedule.course)) \
+            .order_by(Schedule.weekday, Schedule.start_minute).limit(5).all()
 
     return render_template(
         "main/dashboard.html",
-        total_students=total_students,
-        total_courses=total_courses,
-        total_enrolls=total_enrolls,
-        labels=labels,
-        values=values,
-        top_courses=top_courses,
+        **stats,
         gpa_info=gpa_info,
         exams=exams,
         schedules=schedules,
     )
 
 
+# ==============================
+# 📉 Thống kê cache (Admin)
+# ==============================
+@main_bp.route("/cache-stats")
+@login_required
+def cache_stats():
+    """Số lần hit/miss của cache dashboard trong worker hiện tại"""
+    if current_user.role != Role.ADMIN:
+        return jsonify({"error": "forbidden"}), 403
+    return jsonify(dashboard_cache.stats())
+
+
 # ==============================
 # 📅 Trang xem Thời khóa biểu
 # ==============================
 @main_bp.route("/schedule")
 @login_required
 def schedule():
-    """Hiển thị thời khóa biểu"""
-    schedules = Schedule.query.order_by(Schedule.weekday).all()
-    return render_template("main/schedule.html", schedules=schedules)
+    """Hiển thị thời khóa biểu (sinh viên: chỉ các học phần đã ghi danh trong học kỳ hiện tại)"""
+    # Chọn theo vai trò: admin/giảng viên có gắn hồ sơ SV vẫn xem (và sửa) toàn bộ lịch
+    if current_user.role == Role.STUDENT and current_user.student_id:
+        timetable = student_timetable(current_user.student_id)
+        return render_template("main/schedule.html", schedules=timetable.entries, timetable=timetable)
+    schedules = Schedule.query.options(joinedload(Schedule.course)).order_by(Schedule.weekday, Schedule.start_minute).all()
+    return render_template("main/schedule.html", schedules=schedules, timetable=None)
 
 
 # ==============================
@@ -88,7 +128,8 @@ def schedule():
 @login_required
 def exams():
     """Hiển thị lịch thi"""
-    exams = Exam.query.order_by(Exam.date.asc()).all()
+    exams = Exam.query.options(joinedload(Exam.course)) \
+        .order_by(Exam.date.asc(), Exam.start_minute.asc()).all()
     return render_template("main/exams.html", exams=exams)
 
 
@@ -96,6 +137,7 @@ def exams():
 # ✉️ Gửi email thủ công (Admin / Teacher)
 # ==============================
 from ..utils.email_utils import send_grade_notification
+from ..utils.metrics import EMAILS_SENT, EMAILS_FAILED
 from flask_mail import Message
 from ..extensions import mail
 
@@ -123,8 +165,10 @@ def send_email_manual():
                               body="Tin nhắn từ hệ thống Quản lý Sinh viên.")
                 mail.send(msg)
 
+            EMAILS_SENT.inc()
             flash("✅ Email đã được gửi thành công!", "success")
         except Exception as e:
+            EMAILS_FAILED.inc()
             flash(f"❌ Lỗi khi gửi email: {e}", "danger")
 
         return redirect(url_for("main.send_email_manual"))
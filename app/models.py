@@ -1,7 +1,11 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
+from sqlalchemy.orm import make_transient_to_detached
 from flask_login import UserMixin
 from .extensions import db, login_manager
+from .utils.cache import TTLCache, invalidate_on_commit
+from .utils.passwords import hash_password, verify_password, needs_rehash
+from .utils.timeslots import WEEKDAY_NAMES, format_minutes
 
 # ==========================
 # 🎯 Vai trò hệ thống
@@ -21,18 +25,45 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), default=Role.STUDENT, nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey("student.id"), nullable=True)
+    student_id = db.Column(db.Integer, db.ForeignKey("student.id"), nullable=True, index=True)
 
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return needs_rehash(self.password_hash)
+
+
+# Danh tính người dùng đăng nhập: cache theo worker, xóa khi commit có ghi vào bảng user
+# (đổi role / liên kết sinh viên); worker khác thấy thay đổi sau tối đa USER_CACHE_TTL giây
+user_cache = TTLCache("user")
+invalidate_on_commit(user_cache, User)
+
+
+def _user_snapshot(user_id):
+    """Các cột của user, trừ password_hash (đăng nhập luôn đọc lại user từ DB; truy cập thì lazy load)"""
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs
+            if attr.key != "password_hash"}
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    ttl = current_app.config["USER_CACHE_TTL"]
+    if ttl <= 0:
+        return db.session.get(User, int(user_id))
+    snapshot = user_cache.get_or_set(int(user_id), lambda: _user_snapshot(int(user_id)), ttl=ttl)
+    if snapshot is None:
+        return None
+    # Gắn bản sao vào session của request mà không SELECT lại (lazy load vẫn dùng được)
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
 
 
 # ==========================
@@ -45,9 +76,12 @@ class Student(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     class_name = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = db.relationship("User", backref="student", uselist=False)
     enrollments = db.relationship("Enrollment", backref="student", cascade="all, delete-orphan")
+    gpa_summary = db.relationship("StudentGpa", uselist=False, cascade="all, delete-orphan")
+    standings = db.relationship("AcademicStanding", cascade="all, delete-orphan")
 
 
 # ==========================
@@ -59,6 +93,7 @@ class Course(db.Model):
     name = db.Column(db.String(120), nullable=False)
     credits = db.Column(db.Integer, nullable=False, default=3)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     enrollments = db.relationship("Enrollment", backref="course", cascade="all, delete-orphan")
     exams = db.relationship("Exam", backref="course", cascade="all, delete-orphan")
@@ -71,11 +106,13 @@ class Course(db.Model):
 class Enrollment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("student.id"), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey("course.id"), nullable=False)
-    semester = db.Column(db.String(10), nullable=True)
-    grade = db.Column(db.Float, nullable=True)  # 0-10 scale
+    course_id = db.Column(db.Integer, db.ForeignKey("course.id"), nullable=False, index=True)
+    semester = db.Column(db.String(10), nullable=True, index=True)
+    grade = db.Column(db.Float, nullable=True, index=True)  # 0-10 scale
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # student_id đứng đầu uq_enroll_sem nên lọc theo sinh viên đã có chỉ mục
     __table_args__ = (
         db.UniqueConstraint("student_id", "course_id", "semester", name="uq_enroll_sem"),
     )
@@ -84,17 +121,30 @@ class Enrollment(db.Model):
 # ==========================
 # 🧮 Chuyển đổi điểm & tính GPA
 # ==========================
+# Ngưỡng điểm hệ 10 -> (điểm chữ, điểm hệ 4); dưới ngưỡng cuối là F
+GRADE_SCALE = [
+    (8.5, "A", 4.0),
+    (7.0, "B", 3.0),
+    (5.5, "C", 2.0),
+    (4.0, "D", 1.0),
+]
+
+
 def grade_to_letter_and_gpa(grade_10: float):
     if grade_10 is None:
         return None, None
     g = float(grade_10)
-    if g >= 8.5: return "A", 4.0
-    if g >= 7.0: return "B", 3.0
-    if g >= 5.5: return "C", 2.0
-    if g >= 4.0: return "D", 1.0
+    for threshold, letter, points in GRADE_SCALE:
+        if g >= threshold:
+            return letter, points
     return "F", 0.0
 
 
+def grade_points_sql(column):
+    """Biểu thức SQL tương đương grade_to_letter_and_gpa (chỉ phần điểm hệ 4)"""
+    return db.case(*[(column >= t, p) for t, _, p in GRADE_SCALE], else_=0.0)
+
+
 def compute_student_gpa(student_id: int):
     enrolls = Enrollment.query.filter_by(student_id=student_id).all()
     total_points, total_credits = 0.0, 0
@@ -108,15 +158,79 @@ def compute_student_gpa(student_id: int):
     return gpa, total_credits
 
 
+def get_student_gpa(student_id: int):
+    """Đọc GPA từ bảng tổng hợp student_gpa (1 truy vấn theo khóa chính)"""
+    row = db.session.query(StudentGpa.gpa, StudentGpa.total_credits) \
+        .filter(StudentGpa.student_id == student_id).first()
+    if row is None:
+        # Sinh viên chưa có bản tổng hợp (mới tạo / chưa chạy flask rebuild-gpa)
+        return compute_student_gpa(student_id)
+    return row.gpa, row.total_credits
+
+
+# ==========================
+# 📊 Bảng tổng hợp GPA theo sinh viên
+# ==========================
+class StudentGpa(db.Model):
+    student_id = db.Column(db.Integer, db.ForeignKey("student.id"), primary_key=True)
+    gpa = db.Column(db.Float, nullable=False, default=0.0)
+    total_credits = db.Column(db.Integer, nullable=False, default=0)
+    # {"2025A": {"gpa": 3.5, "credits": 7}, ...}
+    semesters = db.Column(db.JSON, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# ==========================
+# 🎓 Kết quả học tập theo học kỳ (flask compute-standing)
+# ==========================
+class AcademicStanding(db.Model):
+    PROBATION = "probation"     # cảnh báo học vụ
+    DEANS_LIST = "deans_list"   # khen thưởng học kỳ
+    GOOD = "good"
+    CHOICES = [PROBATION, DEANS_LIST, GOOD]
+
+    student_id = db.Column(db.Integer, db.ForeignKey("student.id"), primary_key=True)
+    semester = db.Column(db.String(10), primary_key=True)  # "" = ghi danh không ghi học kỳ
+    term_gpa = db.Column(db.Float, nullable=False)
+    term_credits = db.Column(db.Integer, nullable=False)
+    cumulative_gpa = db.Column(db.Float, nullable=False)  # tính đến hết học kỳ này
+    cumulative_credits = db.Column(db.Integer, nullable=False)
+    standing = db.Column(db.String(20), nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Danh sách cảnh báo / khen thưởng của một học kỳ
+    __table_args__ = (db.Index("ix_standing_semester", "semester", "standing"),)
+
+
+class StandingQueue(db.Model):
+    """
+    SV có điểm thay đổi từ lần chạy trước (refresh_student_gpa ghi vào, job đọc rồi xóa).
+    Mỗi SV một dòng: sửa điểm lần nữa chỉ cập nhật queued_at, bảng không phình theo số lần sửa.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, nullable=False, unique=True, index=True)
+    queued_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 # ==========================
 # 🗓️ Bảng lịch thi
 # ==========================
 class Exam(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    course_id = db.Column(db.Integer, db.ForeignKey("course.id"))
+    course_id = db.Column(db.Integer, db.ForeignKey("course.id"), index=True)
     date = db.Column(db.Date)
+    start_minute = db.Column(db.Integer)  # Giờ bắt đầu ca thi (phút từ 0h), None = chưa xếp ca
     room = db.Column(db.String(50))
     note = db.Column(db.String(255))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_exam_date_start", "date", "start_minute"),
+    )
+
+    @property
+    def start_time(self):
+        return format_minutes(self.start_minute)
 
 
 # ==========================
@@ -124,7 +238,55 @@ class Exam(db.Model):
 # ==========================
 class Schedule(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    course_id = db.Column(db.Integer, db.ForeignKey("course.id"))
-    weekday = db.Column(db.String(20))  # Ví dụ: "Thứ Hai", "Thứ Ba"
-    time = db.Column(db.String(50))     # Ví dụ: "07:30 - 09:30"
+    course_id = db.Column(db.Integer, db.ForeignKey("course.id"), index=True)
+    weekday = db.Column(db.Integer)       # 1 = Thứ Hai ... 7 = Chủ Nhật
+    start_minute = db.Column(db.Integer)  # Phút tính từ 0h, ví dụ 450 = 07:30
+    end_minute = db.Column(db.Integer)
     room = db.Column(db.String(50))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Sắp xếp theo thứ + giờ bắt đầu (trang TKB, dashboard)
+        db.Index("ix_schedule_weekday_start", "weekday", "start_minute"),
+        # Kiểm tra trùng phòng: chỉ duyệt các buổi của đúng phòng/thứ đó
+        db.Index("ix_schedule_room_slot", "room", "weekday", "start_minute"),
+    )
+
+    @property
+    def weekday_name(self):
+        return WEEKDAY_NAMES.get(self.weekday, "")
+
+    @property
+    def course_name(self):
+        return self.course.name if self.course else ""
+
+    @property
+    def time_range(self):
+        """Ví dụ: "07:30 - 09:30" """
+        return f"{format_minutes(self.start_minute)} - {format_minutes(self.end_minute)}"
+
+
+# ==========================
+# 📨 Hàng đợi email gửi đi
+# ==========================
+class MailQueue(db.Model):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=True)   # Email thường
+    body = db.Column(db.Text, nullable=True)
+    course_name = db.Column(db.String(120), nullable=True)  # Email điểm (có thể gộp)
+    grade = db.Column(db.Float, nullable=True)
+    status = db.Column(db.String(10), default=PENDING, nullable=False, index=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    last_error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_grade(self):
+        return self.grade is not None
@@ -1,26 +1,56 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from app.models import Schedule, Course
 from app.extensions import db, csrf
+from app.utils.timeslots import (WEEKDAY_NAMES, parse_weekday, parse_clock, format_minutes,
+                                 find_room_conflicts)
 
 schedule_bp = Blueprint("schedules", __name__, template_folder="../templates")
 
+
+@schedule_bp.context_processor
+def _timeslot_helpers():
+    return {"weekday_names": WEEKDAY_NAMES, "format_minutes": format_minutes}
+
+
 # === Trang danh sách thời khóa biểu ===
 @schedule_bp.route("/")
 def index():
-    schedules = Schedule.query.all()
+    schedules = Schedule.query.order_by(Schedule.weekday, Schedule.start_minute).all()
     return render_template("schedules/index.html", schedules=schedules)
 
+def _read_form(exclude_id=None):
+    """Đọc + kiểm tra form; trả về (dữ liệu, None) hoặc (None, thông báo lỗi)"""
+    weekday = parse_weekday(request.form.get("weekday"))
+    start = parse_clock(request.form.get("start_time"))
+    end = parse_clock(request.form.get("end_time"))
+    room = (request.form.get("room") or "").strip()
+    if not weekday or start is None or end is None or not room:
+        return None, "❌ Vui lòng nhập đầy đủ thứ, giờ học và phòng!"
+    if end <= start:
+        return None, "❌ Giờ kết thúc phải sau giờ bắt đầu!"
+
+    conflicts = find_room_conflicts(room, weekday, start, end, exclude_id=exclude_id)
+    if conflicts:
+        other = conflicts[0]
+        name = other.course.name if other.course else f"#{other.id}"
+        return None, (f"⚠️ Phòng {room} đã có lịch {name} "
+                      f"({other.weekday_name}, {other.time_range})!")
+
+    return {"course_id": request.form["course_id"], "weekday": weekday,
+            "start_minute": start, "end_minute": end, "room": room}, None
+
+
 # === Thêm mới TKB ===
 @schedule_bp.route("/create", methods=["GET", "POST"])
 def create():
     courses = Course.query.all()
     if request.method == "POST":
-        s = Schedule(
-            course_id=request.form["course_id"],
-            weekday=request.form["weekday"],
-            time=request.form["time"],
-            room=request.form["room"]
-        )
+        data, error = _read_form()
+        if error:
+            flash(error, "danger")
+            return render_template("schedules/form.html", courses=courses)
+
+        s = Schedule(**data)
         db.session.add(s)
         db.session.commit()
         flash("✅ Đã thêm thời khóa biểu!", "success")
@@ -35,11 +65,13 @@ def edit(id):
     courses = Course.query.all()
 
     if request.method == "POST":
-        schedule.course_id = request.form["course_id"]
-        schedule.weekday = request.form["weekday"]
-        schedule.time = request.form["time"]
-        schedule.room = request.form["room"]
+        data, error = _read_form(exclude_id=schedule.id)
+        if error:
+            flash(error, "danger")
+            return render_template("schedules/form.html", schedule=schedule, courses=courses)
 
+        for key, value in data.items():
+            setattr(schedule, key, value)
         db.session.commit()
         flash("✏️ Đã cập nhật thời khóa biểu!", "info")
         return redirect(url_for("schedules.index"))
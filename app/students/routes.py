@@ -2,6 +2,8 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from ..extensions import db, csrf
 from ..models import Student, Role
+from ..utils.pagination import keyset_paginate
+from ..utils.search import student_search_filter
 
 students_bp = Blueprint("students", __name__, template_folder="../templates/students")
 
@@ -31,14 +33,9 @@ def index():
     q = request.args.get("q", "").strip()
     query = Student.query
     if q:
-        like = f"%{q}%"
-        query = query.filter(
-            (Student.full_name.ilike(like)) |
-            (Student.code.ilike(like)) |
-            (Student.email.ilike(like))
-        )
-    students = query.order_by(Student.id.desc()).all()
-    return render_template("students/index.html", students=students, q=q)
+        query = query.filter(student_search_filter(q))
+    page = keyset_paginate(query, Student.id)
+    return render_template("students/index.html", students=page.items, page=page, q=q)
 
 
 # ==============================
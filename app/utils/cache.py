@@ -0,0 +1,145 @@
+# app/utils/cache.py
+import threading
+import time
+from sqlalchemy import event
+from flask_sqlalchemy.session import Session
+
+
+# ==========================
+# ⏱️ Cache theo tiến trình có TTL
+# ==========================
+class TTLCache:
+    """
+    Cache đơn giản trong bộ nhớ của từng worker.
+    Worker ghi dữ liệu sẽ xóa cache ngay; các worker khác thấy dữ liệu mới khi hết TTL.
+    Tối đa `maxsize` khóa: mục hết hạn được dọn định kỳ, đầy thì bỏ mục ghi sớm nhất.
+    """
+
+    def __init__(self, name, ttl=60, maxsize=10000):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._data = {}
+        self._lock = threading.Lock()
+        self._generation = 0   # tăng mỗi lần invalidate()
+        self._next_purge = 0.0
+
+    def get_or_set(self, key, factory, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        else:
+            self.ttl = ttl  # TTL theo config do nơi gọi truyền vào: stats() báo đúng giá trị này
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        value = factory()
+        with self._lock:
+            # Có invalidate() trong lúc factory chạy: giá trị có thể đọc trước commit, không lưu
+            if generation == self._generation:
+                self._store(key, (now + ttl, value), now)
+        return value
+
+    def _store(self, key, entry, now):
+        if now >= self._next_purge:
+            expired = [k for k, (expires, _) in self._data.items() if expires <= now]
+            for k in expired:
+                del self._data[k]
+            self.evictions += len(expired)
+            self._next_purge = now + self.ttl
+        self._data.pop(key, None)  # ghi lại xuống cuối: thứ tự dict = thứ tự ghi
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+            self.evictions += 1
+        self._data[key] = entry
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "ttl": self.ttl,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# ==========================
+# 🧹 Xóa cache khi commit thay đổi trên các model theo dõi
+# ==========================
+_watchers = []  # (tuple model, cache)
+
+
+def invalidate_on_commit(cache, *models):
+    """Đăng ký xóa `cache` sau mỗi commit có ghi vào một trong các `models`"""
+    _watchers.append((models, cache))
+
+
+def invalidate_after_commit(session, cache):
+    """Xóa cả `cache` khi transaction hiện tại của `session` commit"""
+    session.info.setdefault("_dirty_caches", set()).add(cache)
+
+
+def invalidate_keys_after_commit(session, cache, keys):
+    """Chỉ xóa các khóa `keys` của `cache` khi transaction hiện tại của `session` commit"""
+    session.info.setdefault("_dirty_cache_keys", {}).setdefault(cache, set()).update(keys)
+
+
+def _mark(session, models_touched):
+    for models, cache in _watchers:
+        if any(issubclass(m, models) for m in models_touched):
+            invalidate_after_commit(session, cache)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    touched = {type(obj) for obj in (*session.new, *session.dirty, *session.deleted)}
+    if touched:
+        _mark(session, touched)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk(orm_execute_state):
+    # INSERT/UPDATE/DELETE theo lô (session.execute(db.insert(Model), ...)) không qua flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _mark(orm_execute_state.session, {mapper.class_})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    caches = session.info.pop("_dirty_caches", set())
+    for cache in caches:
+        cache.invalidate()
+    for cache, keys in session.info.pop("_dirty_cache_keys", {}).items():
+        if cache not in caches:
+            for key in keys:
+                cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop("_dirty_caches", None)
+    session.info.pop("_dirty_cache_keys", None)
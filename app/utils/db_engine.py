@@ -0,0 +1,64 @@
+# app/utils/db_engine.py
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from ..extensions import db
+
+_JOURNAL_MODES = {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _is_sqlite(uri):
+    return make_url(uri).get_backend_name() == "sqlite"
+
+
+def _is_memory(uri):
+    return make_url(uri).database in (None, "", ":memory:")
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS theo loại database:
+    - SQLite: giữ pool mặc định (mỗi kết nối là một file handle), chỉ đặt timeout của driver.
+    - MySQL/PostgreSQL: pool_size, max_overflow, pre-ping, recycle lấy từ config.
+    """
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if _is_sqlite(uri):
+        return {"connect_args": {"timeout": config["SQLITE_BUSY_TIMEOUT_MS"] / 1000}}
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def init_sqlite_pragmas(app):
+    """Đặt journal_mode / busy_timeout / synchronous cho mỗi kết nối SQLite mới"""
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if not _is_sqlite(uri):
+        return
+
+    journal_mode = app.config["SQLITE_JOURNAL_MODE"].upper()
+    synchronous = app.config["SQLITE_SYNCHRONOUS"].upper()
+    busy_timeout = int(app.config["SQLITE_BUSY_TIMEOUT_MS"])
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE không hợp lệ: {journal_mode}")
+    if synchronous not in _SYNCHRONOUS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS không hợp lệ: {synchronous}")
+    # SQLite trong RAM không có file journal -> bỏ qua WAL
+    use_journal = not _is_memory(uri)
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, conn_record):
+        cur = dbapi_conn.cursor()
+        # WAL: người đọc không chặn người ghi và ngược lại; nhiều worker gunicorn đọc song song
+        if use_journal:
+            cur.execute(f"PRAGMA journal_mode={journal_mode}")
+        cur.execute(f"PRAGMA busy_timeout={busy_timeout}")
+        # NORMAL + WAL: vẫn an toàn khi app crash, chỉ fsync ở checkpoint
+        cur.execute(f"PRAGMA synchronous={synchronous}")
+        cur.close()
@@ -2,11 +2,9 @@
 from flask_mail import Message
 from app.extensions import mail
 
-def send_grade_notification(student_email, course_name, grade):
-    """Gửi email thông báo điểm cho sinh viên"""
-    if not student_email:
-        return
 
+def build_grade_message(student_email, course_name, grade):
+    """Tạo email thông báo điểm (chưa gửi)"""
     # Nội dung email tùy theo kết quả học tập
     if grade < 5:
         subject = f"[CẢNH BÁO] Kết quả học tập môn {course_name}"
@@ -24,5 +22,28 @@ def send_grade_notification(student_email, course_name, grade):
         subject = f"Kết quả học tập môn {course_name}"
         body = f"Điểm của bạn trong môn {course_name} là {grade}."
 
-    msg = Message(subject=subject, recipients=[student_email], body=body)
-    mail.send(msg)
+    return Message(subject=subject, recipients=[student_email], body=body)
+
+
+def build_grade_digest(student_email, grades):
+    """Gộp nhiều điểm [(tên học phần, điểm), ...] của cùng sinh viên thành một email"""
+    if len(grades) == 1:
+        return build_grade_message(student_email, *grades[0])
+
+    lines = [f"- {course_name}: {grade}" for course_name, grade in grades]
+    body = "Kết quả học tập mới của bạn:\n\n" + "\n".join(lines)
+    if any(grade < 5 for _, grade in grades):
+        subject = f"[CẢNH BÁO] Kết quả học tập {len(grades)} học phần"
+        body += "\n\nVui lòng liên hệ cố vấn học tập để được hỗ trợ cải thiện kết quả."
+    else:
+        subject = f"Kết quả học tập {len(grades)} học phần"
+
+    return Message(subject=subject, recipients=[student_email], body=body)
+
+
+def send_grade_notification(student_email, course_name, grade):
+    """Gửi email thông báo điểm cho sinh viên"""
+    if not student_email:
+        return
+
+    mail.send(build_grade_message(student_email, course_name, grade))
@@ -0,0 +1,256 @@
+# app/utils/exam_scheduler.py
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import timedelta
+import click
+from flask import current_app
+from ..extensions import db
+from .timeslots import parse_clock, format_minutes, current_semester
+
+
+class ExamScheduleError(ValueError):
+    """Dữ liệu đầu vào không xếp được lịch (thiếu phòng, phòng quá nhỏ...)"""
+
+
+@dataclass
+class ExamPlan:
+    semester: str
+    courses: int = 0
+    students: int = 0
+    edges: int = 0              # số cặp học phần có chung sinh viên
+    slots: list = field(default_factory=list)  # [(date, start_minute, [(course_id, size, [phòng])])]
+    seconds: float = 0.0
+
+    @property
+    def days(self):
+        return len({d for d, _, _ in self.slots})
+
+
+# ==========================
+# ⚙️ Đọc cấu hình phòng / ca thi
+# ==========================
+def parse_rooms(text):
+    """'A101:40, B201:120' (phẩy / xuống dòng) -> [('A101', 40), ('B201', 120)]"""
+    rooms = []
+    for item in (text or "").replace("\n", ",").split(","):
+        if not item.strip():
+            continue
+        name, _, capacity = item.strip().rpartition(":")
+        if not name or not capacity.strip().isdigit() or int(capacity) <= 0:
+            raise ExamScheduleError(f"Phòng không hợp lệ: {item.strip()!r} (dạng TÊN:SỨC_CHỨA)")
+        rooms.append((name.strip(), int(capacity)))
+    return rooms
+
+
+def parse_sessions(text):
+    """'07:30, 13:00' -> [450, 780]"""
+    sessions = [parse_clock(s) for s in (text or "").split(",") if s.strip()]
+    if not sessions or None in sessions:
+        raise ExamScheduleError(f"Ca thi không hợp lệ: {text!r} (dạng HH:MM, HH:MM)")
+    return sorted(set(sessions))
+
+
+# ==========================
+# 🕸️ Đồ thị xung đột học phần
+# ==========================
+def _numpy():
+    """Nạp khi cần: numpy (~80 ms) không nằm trên đường khởi động app (create_app, blueprint exams)"""
+    import numpy
+    return numpy
+
+
+def _distinct(values):
+    """np.unique qua sort (np.unique mặc định dùng bảng băm: chậm hơn nhiều với int64 lớn)"""
+    np = _numpy()
+    values = np.sort(values)
+    return values[np.concatenate(([True], values[1:] != values[:-1]))] if len(values) else values
+
+
+def conflict_graph(student_ids, course_ids):
+    """
+    Hai học phần xung đột nếu có chung ít nhất một sinh viên. Sắp các cặp (SV, HP) theo SV
+    rồi ghép mỗi dòng với dòng cách nó d vị trí (d = 1..số HP nhiều nhất của một SV):
+    toàn bộ là phép toán mảng numpy, không lặp Python theo sinh viên.
+    Trả về (mã HP, sĩ số, indptr, indices): danh sách kề dạng CSR theo chỉ số HP.
+    """
+    np = _numpy()
+    students = np.asarray(student_ids, dtype=np.int64)
+    course_ids = np.asarray(course_ids, dtype=np.int64)
+    courses = _distinct(course_ids)
+    course_idx = np.searchsorted(courses, course_ids)
+    n = len(courses)
+    sizes = np.bincount(course_idx, minlength=n)
+
+    order = np.lexsort((course_idx, students))
+    students, course_idx = students[order], course_idx[order]
+    starts = np.flatnonzero(np.concatenate(([True], students[1:] != students[:-1])))
+    most = int(np.diff(np.append(starts, len(students))).max()) if len(students) else 0
+
+    keys = []
+    for d in range(1, most):
+        same = students[:-d] == students[d:]
+        a, b = course_idx[:-d][same], course_idx[d:][same]
+        keys.append(np.minimum(a, b) * n + np.maximum(a, b))
+    keys = _distinct(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+    a, b = keys // n, keys % n  # a < b: uq_enroll_sem không cho một SV học 2 lần cùng HP/học kỳ
+
+    src, dst = np.concatenate([a, b]), np.concatenate([b, a])
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return courses, sizes, indptr, dst[order]
+
+
+# ==========================
+# 🎨 Tô màu tham lam + xếp phòng
+# ==========================
+class _RoomPool:
+    """Phòng còn trống của một ca: sắp theo sức chứa để chọn phòng vừa khít nhất"""
+
+    def __init__(self, rooms):
+        self.free = sorted((cap, name) for name, cap in rooms)
+        self.seats = sum(cap for cap, _ in self.free)
+
+    def take(self, need):
+        """Phòng cho `need` SV (có thể nhiều phòng) hoặc None nếu không đủ chỗ"""
+        if need > self.seats:
+            return None
+        taken = []
+        while need > 0:
+            i = bisect_left(self.free, (need, ""))
+            cap, name = self.free.pop(i if i < len(self.free) else -1)
+            taken.append((cap, name))
+            need -= cap
+        self.seats -= sum(cap for cap, _ in taken)
+        return [name for _, name in taken]
+
+
+def color_courses(sizes, indptr, indices, rooms):
+    """
+    Welsh-Powell: duyệt HP theo bậc giảm dần (cùng bậc: sĩ số lớn trước), gán ca nhỏ nhất
+    mà không HP kề nào đã dùng và còn đủ phòng. Trả về (ca của từng HP, phòng của từng HP).
+    """
+    np = _numpy()
+    total = sum(cap for _, cap in rooms)
+    too_big = np.flatnonzero(sizes > total)
+    if len(too_big):
+        raise ExamScheduleError(f"{len(too_big)} học phần có sĩ số lớn hơn tổng sức chứa các phòng ({total})")
+
+    degree = np.diff(indptr)
+    order = np.lexsort((-sizes, -degree))
+    slot_of = np.full(len(sizes), -1, dtype=np.int64)
+    room_of = [None] * len(sizes)
+    pools = []
+    for i in order.tolist():
+        used = slot_of[indices[indptr[i]:indptr[i + 1]]]
+        blocked = np.zeros(len(pools) + 1, dtype=bool)
+        blocked[used[used >= 0]] = True
+        slot = 0
+        while True:
+            if slot == len(pools):
+                pools.append(_RoomPool(rooms))
+                blocked = np.append(blocked, False)
+            if not blocked[slot]:
+                taken = pools[slot].take(int(sizes[i]))
+                if taken is not None:
+                    break
+            slot += 1
+        slot_of[i], room_of[i] = slot, taken
+    return slot_of, room_of
+
+
+def _slot_dates(start_date, n_days):
+    """Các ngày thi liên tiếp từ start_date, bỏ Chủ Nhật"""
+    days, day = [], start_date
+    while len(days) < n_days:
+        if day.weekday() != 6:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+# ==========================
+# 🗓️ Xếp lịch thi cả học kỳ
+# ==========================
+def plan_exams(semester, start_date, rooms, sessions):
+    """Xếp lịch (chưa ghi DB) cho mọi học phần có SV ghi danh trong học kỳ"""
+    from ..models import Enrollment
+
+    np = _numpy()
+    if not rooms:
+        raise ExamScheduleError("Chưa khai báo phòng thi (EXAM_ROOMS hoặc --rooms)")
+    t0 = time.perf_counter()
+    # Đọc thẳng từ cursor DBAPI: bỏ bước dựng Row của SQLAlchemy cho hàng trăm nghìn dòng
+    t = Enrollment.__table__
+    result = db.session.connection().execute(
+        db.select(t.c.student_id, t.c.course_id).where(t.c.semester == semester)
+    )
+    pairs = np.array(result.cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+    result.close()
+    plan = ExamPlan(semester=semester)
+    if not len(pairs):
+        return plan
+
+    student_ids, course_ids = pairs[:, 0], pairs[:, 1]
+    courses, sizes, indptr, indices = conflict_graph(student_ids, course_ids)
+    slot_of, room_of = color_courses(sizes, indptr, indices, rooms)
+
+    n_slots = int(slot_of.max()) + 1
+    dates = _slot_dates(start_date, -(-n_slots // len(sessions)))
+    plan.slots = [(dates[s // len(sessions)], sessions[s % len(sessions)], []) for s in range(n_slots)]
+    for i, s in enumerate(slot_of.tolist()):
+        plan.slots[s][2].append((int(courses[i]), int(sizes[i]), room_of[i]))
+    plan.courses, plan.students = len(courses), len(_distinct(student_ids))
+    plan.edges = len(indices) // 2
+    plan.seconds = time.perf_counter() - t0
+    return plan
+
+
+def save_plan(plan, note="Cuối kỳ"):
+    """Thay các lịch thi cùng ghi chú của những HP trong kế hoạch; mỗi phòng một dòng Exam"""
+    from ..models import Exam
+
+    course_ids = [cid for _, _, items in plan.slots for cid, _, _ in items]
+    for i in range(0, len(course_ids), 500):
+        db.session.execute(db.delete(Exam).where(Exam.note == note,
+                                                 Exam.course_id.in_(course_ids[i:i + 500])))
+    rows = [{"course_id": cid, "date": day, "start_minute": start, "room": room, "note": note}
+            for day, start, items in plan.slots for cid, _, names in items for room in names]
+    if rows:
+        db.session.execute(db.insert(Exam), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def register_exam_commands(app):
+    @app.cli.command("schedule-exams")
+    @click.option("--semester", default=None, help="Học kỳ (mặc định: học kỳ mới nhất có ghi danh).")
+    @click.option("--start", "start_date", type=click.DateTime(["%Y-%m-%d"]), required=True,
+                  help="Ngày thi đầu tiên (YYYY-MM-DD).")
+    @click.option("--rooms", default=None, help="TÊN:SỨC_CHỨA,... (mặc định EXAM_ROOMS).")
+    @click.option("--sessions", default=None, help="Giờ bắt đầu các ca, ví dụ 07:30,13:00 (mặc định EXAM_SESSIONS).")
+    @click.option("--note", default="Cuối kỳ", show_default=True)
+    @click.option("--dry-run", is_flag=True, help="Chỉ in kết quả, không ghi lịch thi.")
+    def schedule_exams(semester, start_date, rooms, sessions, note, dry_run):
+        """Tự xếp lịch thi: không SV nào có hai môn thi cùng ca, không vượt sức chứa phòng."""
+        with app.app_context():
+            semester = semester or current_semester()
+            try:
+                plan = plan_exams(semester, start_date.date(),
+                                  parse_rooms(rooms or current_app.config["EXAM_ROOMS"]),
+                                  parse_sessions(sessions or current_app.config["EXAM_SESSIONS"]))
+            except ExamScheduleError as e:
+                raise click.ClickException(str(e))
+            if not plan.slots:
+                print(f"⚠️ Học kỳ {semester} chưa có ghi danh nào.")
+                return
+
+            print(f"📚 {semester}: {plan.courses} học phần, {plan.students} SV, "
+                  f"{plan.edges} cặp xung đột -> {len(plan.slots)} ca / {plan.days} ngày "
+                  f"({plan.seconds:.1f}s)")
+            for day, start, items in plan.slots:
+                print(f"  {day:%d/%m/%Y} {format_minutes(start)}  {len(items):>4} HP  "
+                      f"{sum(size for _, size, _ in items):>6} SV")
+            if not dry_run:
+                print(f"✅ Đã ghi {save_plan(plan, note)} lịch thi ({note}).")
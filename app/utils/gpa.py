@@ -0,0 +1,137 @@
+# app/utils/gpa.py
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import event, inspect
+from flask_sqlalchemy.session import Session
+from ..extensions import db
+from ..models import Student, Course, Enrollment, StudentGpa, grade_points_sql
+from .standing import queue_students
+
+CHUNK_SIZE = 500
+
+# Thay đổi ở các cột này của Enrollment làm GPA sinh viên thay đổi
+_ENROLL_FIELDS = ("student_id", "course_id", "semester", "grade")
+
+
+# ==========================
+# 🧮 Tính GPA theo tập sinh viên (set-based)
+# ==========================
+def _aggregate(conn, student_ids=None):
+    """
+    Một truy vấn GROUP BY (student_id, semester) cho cả tập sinh viên.
+    Trả về {student_id: {"gpa", "total_credits", "semesters"}}.
+    """
+    points = grade_points_sql(Enrollment.grade) * Course.credits
+    stmt = db.select(
+        Enrollment.student_id, Enrollment.semester,
+        db.func.sum(points).label("points"),
+        db.func.sum(Course.credits).label("credits"),
+    ).join(Course, Enrollment.course_id == Course.id) \
+     .where(Enrollment.grade.isnot(None)) \
+     .group_by(Enrollment.student_id, Enrollment.semester)
+    if student_ids is not None:
+        stmt = stmt.where(Enrollment.student_id.in_(student_ids))
+
+    totals = defaultdict(lambda: [0.0, 0, {}])
+    for r in conn.execute(stmt):
+        t = totals[r.student_id]
+        t[0] += r.points or 0.0
+        t[1] += r.credits or 0
+        t[2][r.semester or ""] = {
+            "gpa": round(r.points / r.credits, 2) if r.credits else 0.0,
+            "credits": int(r.credits or 0),
+        }
+    return {
+        sid: {"gpa": round(p / c, 2) if c else 0.0, "total_credits": int(c), "semesters": sem}
+        for sid, (p, c, sem) in totals.items()
+    }
+
+
+def _rows(student_ids, aggregates):
+    now = datetime.utcnow()
+    empty = {"gpa": 0.0, "total_credits": 0, "semesters": {}}
+    return [dict(student_id=sid, updated_at=now, **aggregates.get(sid, empty))
+            for sid in student_ids]
+
+
+def refresh_student_gpa(student_ids, conn=None):
+    """Tính lại bảng student_gpa cho các sinh viên cho trước (trong transaction hiện tại)"""
+    conn = conn if conn is not None else db.session.connection()
+    ids = sorted(set(student_ids))
+    table = StudentGpa.__table__
+    for i in range(0, len(ids), CHUNK_SIZE):
+        part = ids[i:i + CHUNK_SIZE]
+        rows = _rows(part, _aggregate(conn, part))
+        conn.execute(table.delete().where(table.c.student_id.in_(part)))
+        conn.execute(table.insert(), rows)
+    # Mọi đường ghi điểm đều đi qua đây: đánh dấu cho job xếp loại học kỳ (flask compute-standing)
+    queue_students(ids, conn)
+    return len(ids)
+
+
+def rebuild_all_gpa():
+    """Tính lại toàn bộ bảng student_gpa bằng một lần GROUP BY trên cả bảng enrollment"""
+    conn = db.session.connection()
+    aggregates = _aggregate(conn)
+    ids = [r.id for r in conn.execute(db.select(Student.id))]
+    table = StudentGpa.__table__
+    conn.execute(table.delete())
+    rows = _rows(ids, aggregates)
+    for i in range(0, len(rows), CHUNK_SIZE):
+        conn.execute(table.insert(), rows[i:i + CHUNK_SIZE])
+    db.session.commit()
+    return len(ids)
+
+
+# ==========================
+# 🔁 Cập nhật tăng dần khi ORM flush
+# ==========================
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_gpa(session, flush_context):
+    student_ids, course_ids, deleted = set(), set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, Enrollment):
+            student_ids.add(obj.student_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Enrollment) and _changed(obj, _ENROLL_FIELDS):
+            student_ids.add(obj.student_id)
+            # Bản ghi bị chuyển sang sinh viên khác: cập nhật cả sinh viên cũ
+            student_ids.update(inspect(obj).attrs.student_id.history.deleted)
+        elif isinstance(obj, Course) and _changed(obj, ("credits",)):
+            course_ids.add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, Enrollment):
+            student_ids.add(obj.student_id)
+        elif isinstance(obj, Student):
+            deleted.add(obj.id)
+
+    if not student_ids and not course_ids:
+        return
+
+    conn = session.connection()
+    if course_ids:
+        student_ids.update(r.student_id for r in conn.execute(
+            db.select(Enrollment.student_id).distinct()
+            .where(Enrollment.course_id.in_(course_ids))))
+
+    student_ids -= deleted
+    student_ids.discard(None)
+    if student_ids:
+        refresh_student_gpa(student_ids, conn)
+
+
+def register_gpa_commands(app):
+    @app.cli.command("rebuild-gpa")
+    def rebuild_gpa():
+        """Tính lại toàn bộ bảng tổng hợp GPA."""
+        with app.app_context():
+            n = rebuild_all_gpa()
+            print(f"✅ Đã tính lại GPA cho {n} sinh viên.")
@@ -0,0 +1,57 @@
+# app/utils/grade_export.py
+import csv
+import io
+from ..extensions import db
+from ..models import Student, Course, Enrollment
+
+EXPORT_COLUMNS = [
+    "student_code", "student_name", "course_code", "course_name",
+    "credits", "semester", "grade",
+]
+
+# Số dòng lấy mỗi lần từ server-side cursor
+YIELD_PER = 2000
+
+
+def iter_grade_rows(student_id=None, all_students=False):
+    """
+    Duyệt bảng điểm bằng một truy vấn JOIN duy nhất (không N+1),
+    đọc dần theo từng lô qua server-side cursor thay vì .all().
+    Chỉ lấy điểm của student_id, trừ khi all_students=True
+    (student_id None mà không có cờ -> không có dòng nào).
+    """
+    query = db.session.query(
+        Student.code, Student.full_name,
+        Course.code, Course.name, Course.credits,
+        Enrollment.semester, Enrollment.grade,
+    ).join(Student, Enrollment.student_id == Student.id) \
+     .join(Course, Enrollment.course_id == Course.id)
+    if not all_students:
+        query = query.filter(Enrollment.student_id == student_id)
+    return query.order_by(Enrollment.id).yield_per(YIELD_PER)
+
+
+def write_grades_xlsx(rows, fileobj):
+    """Ghi file xlsx ở chế độ write-only: từng dòng được đẩy ra đĩa, không giữ cả sheet trong RAM"""
+    from openpyxl import Workbook  # Nạp khi cần
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("grades")
+    ws.append(EXPORT_COLUMNS)
+    for row in rows:
+        ws.append(tuple(row))
+    wb.save(fileobj)
+
+
+def iter_grades_csv(rows):
+    """Sinh từng đoạn CSV để trả về qua streaming response"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM để Excel hiển thị đúng tiếng Việt
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,231 @@
+# app/utils/grade_import.py
+import math
+import re
+from dataclasses import dataclass, field
+from ..extensions import db
+from ..models import Student, Course, Enrollment
+from .gpa import refresh_student_gpa
+from .metrics import IMPORT_ROWS
+
+# Số tham số tối đa cho mỗi câu IN (...) / mỗi lô INSERT, UPDATE
+# (SQLite cũ giới hạn 999 biến cho mỗi câu lệnh)
+CHUNK_SIZE = 500
+
+# Mã học kỳ: năm + A (xuân) / B (thu), ví dụ 2025A
+SEMESTER_RE = re.compile(r"\d{4}[AB]")
+
+INSERTED = "inserted"
+UPDATED = "updated"
+SKIPPED = "skipped"
+
+
+# ==========================
+# 📋 Kết quả import từng dòng
+# ==========================
+@dataclass
+class RowResult:
+    row: int                # Số dòng trong file (tính cả dòng tiêu đề)
+    student_code: str
+    course_code: str
+    semester: str
+    grade: float
+    status: str
+    reason: str = ""
+
+
+@dataclass
+class ImportReport:
+    rows: list = field(default_factory=list)
+    notifications: list = field(default_factory=list)  # (email, tên học phần, điểm)
+
+    def count(self, status):
+        return sum(1 for r in self.rows if r.status == status)
+
+    @property
+    def inserted(self):
+        return self.count(INSERTED)
+
+    @property
+    def updated(self):
+        return self.count(UPDATED)
+
+    @property
+    def skipped(self):
+        return self.count(SKIPPED)
+
+    @property
+    def skipped_rows(self):
+        return [r for r in self.rows if r.status == SKIPPED]
+
+
+# ==========================
+# 🧹 Chuẩn hóa giá trị ô Excel
+# ==========================
+def _is_blank(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return str(value).strip() == ""
+
+
+def _text(value):
+    return None if _is_blank(value) else str(value).strip()
+
+
+def _grade(value):
+    """Trả về (điểm, lỗi). Ô trống nghĩa là chỉ ghi danh, chưa có điểm."""
+    if _is_blank(value):
+        return None, None
+    try:
+        g = float(value)
+    except (TypeError, ValueError):
+        return None, f"Điểm không hợp lệ: {value}"
+    if not 0 <= g <= 10:
+        return None, f"Điểm ngoài thang 0-10: {g}"
+    return g, None
+
+
+def _semester(value):
+    """Trả về (học kỳ, lỗi). Ô trống nghĩa là ghi danh không ghi học kỳ."""
+    if _is_blank(value):
+        return None, None
+    if not isinstance(value, str):
+        return None, f"Học kỳ phải là chuỗi dạng 2025A: {value!r}"
+    semester = value.strip()
+    if len(semester) > Enrollment.semester.type.length or not SEMESTER_RE.fullmatch(semester):
+        return None, f"Học kỳ không hợp lệ (dạng 2025A / 2025B): {semester[:20]}"
+    return semester, None
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ==========================
+# 🔎 Tra cứu hàng loạt
+# ==========================
+def _lookup_students(codes):
+    found = {}
+    for part in _chunks(codes):
+        rows = db.session.query(Student.code, Student.id, Student.email) \
+            .filter(Student.code.in_(part)).all()
+        found.update({r.code: r for r in rows})
+    return found
+
+
+def _lookup_courses(codes):
+    found = {}
+    for part in _chunks(codes):
+        rows = db.session.query(Course.code, Course.id, Course.name) \
+            .filter(Course.code.in_(part)).all()
+        found.update({r.code: r for r in rows})
+    return found
+
+
+def _lookup_enrollments(student_ids):
+    """Map (student_id, course_id, semester) -> (id, grade) của các bản ghi đã có."""
+    found = {}
+    for part in _chunks(student_ids):
+        rows = db.session.query(
+            Enrollment.id, Enrollment.student_id, Enrollment.course_id,
+            Enrollment.semester, Enrollment.grade,
+        ).filter(Enrollment.student_id.in_(part)).all()
+        for r in rows:
+            found[(r.student_id, r.course_id, r.semester)] = (r.id, r.grade)
+    return found
+
+
+# ==========================
+# ⬆️ Import điểm theo lô
+# ==========================
+def import_grades(records, chunk_size=CHUNK_SIZE, commit=True, first_row=2, record_metrics=True):
+    """
+    Ghi danh / cập nhật điểm hàng loạt từ các dict có khóa
+    student_code, course_code, semester, grade.
+    RowResult.row đánh số từ first_row (2: dòng đầu dữ liệu của file Excel; API dùng 0).
+    record_metrics=False: không đếm vào IMPORT_ROWS (chạy thử rồi rollback).
+
+    Toàn bộ mã SV và mã HP được tra cứu một lần, các bản ghi mới được INSERT
+    theo lô và điểm thay đổi được UPDATE theo lô, tất cả trong một transaction.
+    Khóa (student_id, course_id, semester) tuân theo ràng buộc uq_enroll_sem;
+    nếu một khóa xuất hiện nhiều lần trong file thì dòng sau ghi đè dòng trước
+    (dòng trước được tính là bỏ qua, để số thêm / cập nhật khớp số bản ghi đã ghi).
+    Ô điểm trống chỉ ghi danh: bản ghi đã có thì giữ nguyên điểm.
+    """
+    report = ImportReport()
+    parsed = []
+    for i, rec in enumerate(records, start=first_row):
+        student_code = _text(rec.get("student_code"))
+        course_code = _text(rec.get("course_code"))
+        semester, semester_error = _semester(rec.get("semester"))
+        grade, error = _grade(rec.get("grade"))
+        result = RowResult(i, student_code, course_code, semester, grade, SKIPPED)
+        if not student_code or not course_code:
+            result.reason = "Thiếu mã SV hoặc mã HP"
+        elif semester_error or error:
+            result.reason = semester_error or error
+        else:
+            result.status = None
+        report.rows.append(result)
+        if result.status is None:
+            parsed.append(result)
+
+    students = _lookup_students({r.student_code for r in parsed})
+    courses = _lookup_courses({r.course_code for r in parsed})
+    existing = _lookup_enrollments({s.id for s in students.values()})
+
+    inserts, updates, mails, written = {}, {}, {}, {}
+    for r in parsed:
+        s = students.get(r.student_code)
+        c = courses.get(r.course_code)
+        if s is None:
+            r.status, r.reason = SKIPPED, f"Không tìm thấy mã SV {r.student_code}"
+            continue
+        if c is None:
+            r.status, r.reason = SKIPPED, f"Không tìm thấy mã HP {r.course_code}"
+            continue
+
+        key = (s.id, c.id, r.semester)
+        if r.grade is None and (key in inserts or key in existing):
+            # Ô điểm trống = "đã ghi danh, chưa có điểm": không xóa điểm đã có
+            r.status, r.reason = SKIPPED, "Không có điểm (đã ghi danh)"
+            continue
+        if key in inserts:
+            inserts[key]["grade"] = r.grade
+            r.status = INSERTED
+        elif key in existing:
+            enroll_id, old_grade = existing[key]
+            if r.grade == old_grade and key not in updates:
+                r.status, r.reason = SKIPPED, "Điểm không thay đổi"
+                continue
+            updates[key] = {"id": enroll_id, "grade": r.grade}
+            r.status = UPDATED
+        else:
+            inserts[key] = {"student_id": s.id, "course_id": c.id,
+                            "semester": r.semester, "grade": r.grade}
+            r.status = INSERTED
+
+        previous = written.get(key)
+        if previous is not None:
+            previous.status, previous.reason = SKIPPED, f"Bị ghi đè bởi dòng {r.row}"
+        written[key] = r
+        mails.pop(key, None)
+        if r.grade is not None and s.email:
+            mails[key] = (s.email, c.name, r.grade)
+
+    for batch in _chunks(inserts.values(), chunk_size):
+        db.session.execute(db.insert(Enrollment), batch)
+    for batch in _chunks(updates.values(), chunk_size):
+        db.session.execute(db.update(Enrollment), batch)
+    # Lệnh INSERT/UPDATE theo lô không đi qua flush nên tự cập nhật bảng GPA
+    refresh_student_gpa({k[0] for k in inserts} | {k[0] for k in updates})
+    if commit:
+        db.session.commit()
+    report.notifications = list(mails.values())
+    if record_metrics:
+        for status in (INSERTED, UPDATED, SKIPPED):
+            IMPORT_ROWS.labels(status).inc(report.count(status))
+    return report
@@ -0,0 +1,173 @@
+# app/utils/mail_queue.py
+import smtplib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask_mail import Message
+from app.extensions import db, mail
+from app.models import MailQueue
+from .email_utils import build_grade_digest
+from .metrics import EMAILS_SENT, EMAILS_FAILED
+
+# Lỗi kết nối: dừng lô hiện tại, các email còn lại để lượt sau
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+def _is_connection_error(ex):
+    """Mất kết nối hoặc lỗi socket. Mọi SMTPException cũng là OSError nhưng chỉ là lỗi của một email."""
+    return isinstance(ex, _CONNECTION_ERRORS) or (
+        isinstance(ex, OSError) and not isinstance(ex, smtplib.SMTPException))
+
+
+def _is_permanent(ex):
+    """Máy chủ trả lời 5xx (người nhận / người gửi / nội dung bị từ chối): gửi lại cũng vô ích"""
+    if isinstance(ex, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in ex.recipients.values()]
+    else:
+        codes = [getattr(ex, "smtp_code", 0)]
+    return bool(codes) and all(isinstance(c, int) and 500 <= c < 600 for c in codes)
+
+
+# ==========================
+# ➕ Đưa email vào hàng đợi
+# ==========================
+def queue_grade_notification(student_email, course_name, grade):
+    """Xếp email thông báo điểm vào hàng đợi (người gọi tự commit)"""
+    if not student_email or grade is None:
+        return None
+    item = MailQueue(recipient=student_email, course_name=course_name, grade=grade)
+    db.session.add(item)
+    return item
+
+
+def queue_grade_notifications(notifications):
+    """Xếp hàng loạt [(email, tên học phần, điểm), ...] bằng một lệnh INSERT theo lô"""
+    now = datetime.utcnow()
+    rows = [
+        {"recipient": email, "course_name": course_name, "grade": grade,
+         "status": MailQueue.PENDING, "attempts": 0,
+         "next_attempt_at": now, "created_at": now}
+        for email, course_name, grade in notifications
+        if email and grade is not None
+    ]
+    if rows:
+        db.session.execute(db.insert(MailQueue), rows)
+    return len(rows)
+
+
+def queue_message(recipient, subject, body):
+    item = MailQueue(recipient=recipient, subject=subject, body=body)
+    db.session.add(item)
+    return item
+
+
+# ==========================
+# 📤 Xử lý hàng đợi
+# ==========================
+def _group(items):
+    """Gộp các email điểm cùng người nhận thành một digest; email thường gửi riêng."""
+    groups = OrderedDict()
+    for item in items:
+        key = ("grade", item.recipient) if item.is_grade else ("plain", item.id)
+        groups.setdefault(key, []).append(item)
+    return list(groups.values())
+
+
+def _build_message(group):
+    first = group[0]
+    if first.is_grade:
+        return build_grade_digest(first.recipient, [(i.course_name, i.grade) for i in group])
+    return Message(subject=first.subject, recipients=[first.recipient], body=first.body)
+
+
+def _mark_failed(group, error, now, permanent=False):
+    max_attempts = current_app.config["MAIL_QUEUE_MAX_ATTEMPTS"]
+    backoff = current_app.config["MAIL_QUEUE_BACKOFF_SECONDS"]
+    for item in group:
+        item.attempts += 1
+        item.last_error = str(error)[:255]
+        if permanent or item.attempts >= max_attempts:
+            item.status = MailQueue.FAILED
+        else:
+            # Backoff lũy thừa: 30s, 60s, 120s, ...
+            item.next_attempt_at = now + timedelta(seconds=backoff * 2 ** (item.attempts - 1))
+
+
+def process_queue(batch_size=None):
+    """
+    Gửi một lô email đến hạn qua một kết nối SMTP duy nhất.
+    Trả về (số email đã gửi, số email lỗi), tính theo email thực gửi sau khi gộp.
+    """
+    batch_size = batch_size or current_app.config["MAIL_QUEUE_BATCH_SIZE"]
+    now = datetime.utcnow()
+    items = MailQueue.query.filter(
+        MailQueue.status == MailQueue.PENDING,
+        MailQueue.next_attempt_at <= now,
+    ).order_by(MailQueue.id).limit(batch_size).all()
+    if not items:
+        return 0, 0
+
+    # Kéo thêm các email điểm đang chờ của cùng người nhận để gộp trọn vào một digest
+    recipients = {i.recipient for i in items if i.is_grade}
+    if recipients:
+        seen = {i.id for i in items}
+        items += [i for i in MailQueue.query.filter(
+            MailQueue.status == MailQueue.PENDING,
+            MailQueue.next_attempt_at <= now,
+            MailQueue.grade.isnot(None),
+            MailQueue.recipient.in_(recipients),
+        ).all() if i.id not in seen]
+
+    sent = failed = 0
+    pending = _group(items)
+    try:
+        with mail.connect() as conn:
+            while pending:
+                group = pending.pop(0)
+                try:
+                    conn.send(_build_message(group))
+                except Exception as ex:
+                    failed += 1
+                    if _is_connection_error(ex):
+                        _mark_failed(group, ex, now)
+                        break
+                    # Lỗi riêng của email này (vd. SMTPRecipientsRefused): gửi tiếp các email khác
+                    _mark_failed(group, ex, now, permanent=_is_permanent(ex))
+                    continue
+                for item in group:
+                    item.status = MailQueue.SENT
+                    item.sent_at = datetime.utcnow()
+                sent += 1
+    except (smtplib.SMTPException, OSError) as ex:
+        # Không mở được / mất kết nối: các email chưa gửi chờ lượt sau
+        for group in pending:
+            _mark_failed(group, ex, now)
+        failed += len(pending)
+
+    db.session.commit()
+    EMAILS_SENT.inc(sent)
+    EMAILS_FAILED.inc(failed)
+    return sent, failed
+
+
+def register_mail_worker_command(app):
+    @app.cli.command("mail-worker")
+    @click.option("--once", is_flag=True, help="Xử lý hết hàng đợi hiện tại rồi thoát.")
+    @click.option("--batch-size", type=int, default=None, help="Số email mỗi lô.")
+    def mail_worker(once, batch_size):
+        """Gửi email trong hàng đợi (chỉ nên chạy một worker)."""
+        poll = app.config["MAIL_QUEUE_POLL_SECONDS"]
+        with app.app_context():
+            print("📨 Mail worker đang chạy...")
+            while True:
+                t0 = time.perf_counter()
+                sent, failed = process_queue(batch_size)
+                if sent or failed:
+                    elapsed = time.perf_counter() - t0
+                    print(f"✅ Đã gửi {sent} email, {failed} lỗi ({elapsed:.2f}s)")
+                    continue
+                if once:
+                    break
+                time.sleep(poll)
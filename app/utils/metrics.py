@@ -0,0 +1,72 @@
+# app/utils/metrics.py
+import os
+import time
+from flask import g, request, Response
+from sqlalchemy import event
+from prometheus_client import (
+    Counter, Histogram, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST, REGISTRY,
+)
+from prometheus_client import multiprocess
+from ..extensions import db
+
+# ==========================
+# 📊 Định nghĩa metric
+# ==========================
+# Nhiều worker gunicorn: đặt PROMETHEUS_MULTIPROC_DIR trước khi khởi động,
+# mỗi tiến trình ghi ra thư mục đó và /metrics gộp lại (xem gunicorn.conf.py).
+REQUEST_LATENCY = Histogram(
+    "qlsv_request_duration_seconds", "Thời gian xử lý request",
+    ["blueprint", "endpoint", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_COUNT = Counter(
+    "qlsv_requests_total", "Số request", ["blueprint", "endpoint", "method", "status"],
+)
+EMAILS_SENT = Counter("qlsv_emails_sent_total", "Số email đã gửi")
+EMAILS_FAILED = Counter("qlsv_emails_failed_total", "Số email gửi lỗi")
+IMPORT_ROWS = Counter("qlsv_import_rows_total", "Số dòng import điểm đã xử lý", ["status"])
+BATCH_SECONDS_PER_1K = Histogram(
+    "qlsv_enrollment_batch_seconds_per_1k", "Thời gian /api/v1/enrollments:batch quy về 1000 bản ghi",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PDFS_RENDERED = Counter("qlsv_pdfs_rendered_total", "Số bảng điểm PDF đã tạo")
+DB_POOL_CHECKOUTS = Counter("qlsv_db_pool_checkouts_total", "Số lần lấy kết nối từ pool DB")
+
+
+def _registry():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view():
+    return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        DB_POOL_CHECKOUTS.inc()
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe(response):
+        started = getattr(g, "_metrics_started", None)
+        if started is None or request.endpoint == "metrics":
+            return response
+        blueprint = request.blueprint or ""
+        endpoint = request.endpoint or "unknown"
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method) \
+            .observe(time.perf_counter() - started)
+        REQUEST_COUNT.labels(blueprint, endpoint, request.method, response.status_code).inc()
+        return response
+
+    app.add_url_rule("/metrics", "metrics", metrics_view)
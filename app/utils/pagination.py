@@ -0,0 +1,67 @@
+# app/utils/pagination.py
+from dataclasses import dataclass
+from flask import request, current_app
+from ..extensions import db
+
+
+# ==========================
+# 📄 Phân trang keyset (?after=<id>&limit=)
+# ==========================
+@dataclass
+class KeysetPage:
+    items: list
+    limit: int
+    after: int = None        # Con trỏ của trang hiện tại
+    next_after: int = None   # Con trỏ cho trang kế tiếp (None nếu là trang cuối)
+    total: int = None        # Tổng số dòng (ước lượng, tối đa count_cap)
+    total_capped: bool = False
+
+    @property
+    def has_more(self):
+        return self.next_after is not None
+
+
+def page_args():
+    """Đọc after/limit từ query string, giới hạn limit theo MAX_PAGE_SIZE"""
+    after = request.args.get("after", type=int)
+    limit = request.args.get("limit", type=int) or current_app.config["PAGE_SIZE"]
+    limit = max(1, min(limit, current_app.config["MAX_PAGE_SIZE"]))
+    return after, limit
+
+
+def estimate_count(query, key, cap=10000):
+    """
+    Đếm tối đa `cap` dòng: SELECT COUNT(*) FROM (... LIMIT cap + 1).
+    Trả về (số dòng, có bị cắt hay không) để hiển thị dạng "10000+".
+    """
+    sub = query.order_by(None).with_entities(key).limit(cap + 1).subquery()
+    n = db.session.query(db.func.count()).select_from(sub).scalar()
+    return min(n, cap), n > cap
+
+
+def keyset_paginate(query, key, after=None, limit=None, descending=True, count_cap=10000):
+    """
+    Lấy một trang theo cột khóa duy nhất `key` (thường là id) mà không dùng OFFSET:
+    WHERE key < after ORDER BY key DESC LIMIT limit + 1.
+    """
+    if after is None and limit is None:
+        after, limit = page_args()
+    limit = limit or current_app.config["PAGE_SIZE"]
+
+    total, capped = (None, False)
+    if count_cap:
+        total, capped = estimate_count(query, key, count_cap)
+
+    if after is not None:
+        query = query.filter(key < after if descending else key > after)
+    query = query.order_by(key.desc() if descending else key.asc())
+    rows = query.limit(limit + 1).all()
+
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_after = getattr(last, key.key)
+
+    return KeysetPage(items=rows, limit=limit, after=after, next_after=next_after,
+                      total=total, total_capped=capped)
@@ -0,0 +1,155 @@
+# app/utils/passwords.py
+import csv
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache, partial
+import click
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+from ..extensions import db
+
+
+class PasswordHashBusy(RuntimeError):
+    """Quá nhiều yêu cầu băm mật khẩu đang chờ (đợt đăng nhập dồn dập)"""
+
+
+# ==========================
+# 🔑 Băm / kiểm tra mật khẩu qua executor giới hạn
+# ==========================
+# scrypt / pbkdf2 của hashlib nhả GIL trong lúc tính, nên vài luồng là đủ dùng hết số
+# CPU cho phép; request vượt hàng đợi bị từ chối ngay thay vì chiếm worker.
+_pool = None
+_slots = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    global _pool, _slots, _pool_pid
+    # Tạo lại sau fork (gunicorn --preload): luồng của tiến trình cha không sang tiến trình con
+    if _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool_pid != os.getpid():
+                workers = current_app.config["PASSWORD_HASH_WORKERS"]
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+                _slots = threading.BoundedSemaphore(workers + current_app.config["PASSWORD_HASH_QUEUE"])
+                _pool_pid = os.getpid()
+    return _pool, _slots
+
+
+def _run(fn, *args):
+    pool, slots = _executor()
+    if not slots.acquire(timeout=current_app.config["PASSWORD_HASH_WAIT_SECONDS"]):
+        raise PasswordHashBusy("password hashing queue is full")
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    return _run(partial(generate_password_hash, method=current_app.config["PASSWORD_HASH_METHOD"]),
+                password)
+
+
+def verify_password(pwhash, password):
+    return _run(check_password_hash, pwhash, password)
+
+
+@lru_cache(maxsize=8)
+def _canonical(method):
+    """'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2' -> 'pbkdf2:sha256:<số vòng mặc định>'"""
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+def needs_rehash(pwhash):
+    """Hash được tạo bằng tham số khác PASSWORD_HASH_METHOD hiện tại"""
+    return pwhash.split("$", 1)[0] != _canonical(current_app.config["PASSWORD_HASH_METHOD"])
+
+
+# ==========================
+# 👥 Tạo tài khoản hàng loạt (cả khóa tuyển sinh)
+# ==========================
+def hash_many(passwords, method, workers=None):
+    """Băm song song trên nhiều tiến trình (mỗi hash tốn hàng trăm ms CPU)"""
+    if len(passwords) < 8:
+        return [generate_password_hash(p, method=method) for p in passwords]
+    chunksize = max(1, len(passwords) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(generate_password_hash, method=method), passwords,
+                             chunksize=chunksize))
+
+
+def provision_student_accounts(students, workers=None, commit=True):
+    """
+    Tạo tài khoản role student (email = email SV) cho các SV chưa có tài khoản,
+    mật khẩu ngẫu nhiên. Trả về [(mã SV, email, mật khẩu)] để gửi cho sinh viên.
+    commit=False: để nơi gọi commit sau khi đã lưu an toàn danh sách mật khẩu.
+    """
+    from ..models import User, Role
+
+    taken = {e for (e,) in db.session.query(User.email)
+             .filter(User.email.in_([s.email for s in students]))}
+    todo = [s for s in students if s.email not in taken]
+    passwords = [secrets.token_urlsafe(9) for _ in todo]
+    hashes = hash_many(passwords, current_app.config["PASSWORD_HASH_METHOD"], workers)
+    rows = [{"email": s.email, "password_hash": h, "role": Role.STUDENT, "student_id": s.id}
+            for s, h in zip(todo, hashes)]
+    if rows:
+        db.session.execute(db.insert(User), rows)
+    if commit:
+        db.session.commit()
+    return [(s.code, s.email, p) for s, p in zip(todo, passwords)]
+
+
+def register_password_commands(app):
+    @app.cli.command("provision-accounts")
+    @click.option("--class", "class_name", default=None, help="Chỉ SV của lớp này.")
+    @click.option("--output", "-o", default="accounts.csv", show_default=True,
+                  help="File CSV (mã SV, email, mật khẩu) để phát cho sinh viên.")
+    @click.option("--workers", type=int, default=None, help="Số tiến trình băm (mặc định = số CPU).")
+    def provision_accounts(class_name, output, workers):
+        """Tạo tài khoản đăng nhập cho sinh viên chưa có tài khoản."""
+        from ..models import Student, User
+
+        with app.app_context():
+            query = Student.query.outerjoin(User, User.student_id == Student.id) \
+                .filter(User.id.is_(None))
+            if class_name:
+                query = query.filter(Student.class_name == class_name)
+            students = query.order_by(Student.code).all()
+            if not students:
+                print("⚠️ Không có sinh viên nào cần tạo tài khoản.")
+                return
+
+            # Tạo file với quyền 0600 ngay từ đầu (không có lúc người khác đọc được),
+            # không ghi đè file mật khẩu của lần chạy trước
+            try:
+                fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                raise click.ClickException(f"{output} đã tồn tại, hãy chọn file khác (--output).")
+            f = os.fdopen(fd, "w", newline="", encoding="utf-8")
+
+            t0 = time.perf_counter()
+            try:
+                accounts = provision_student_accounts(students, workers, commit=False)
+                with f:
+                    writer = csv.writer(f)
+                    writer.writerow(["student_code", "email", "password"])
+                    writer.writerows(accounts)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Chỉ commit khi mật khẩu đã nằm trên đĩa: ghi lỗi thì không để lại tài khoản không ai biết mật khẩu
+                db.session.commit()
+            except BaseException:
+                db.session.rollback()
+                f.close()
+                os.remove(output)
+                raise
+            print(f"✅ Tạo {len(accounts)} tài khoản ({time.perf_counter() - t0:.1f}s) -> {output}")
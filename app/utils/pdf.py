@@ -1,13 +1,31 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
 from io import BytesIO
-from ..models import Student, Enrollment, grade_to_letter_and_gpa, compute_student_gpa
+from sqlalchemy.orm import joinedload
+from .metrics import PDFS_RENDERED
+from ..models import Student, Enrollment, grade_to_letter_and_gpa, get_student_gpa
 
-def build_transcript_pdf(student_id: int):
+def transcript_data(student_id: int):
+    """Dữ liệu thuần (dict) của bảng điểm: dùng để băm nội dung và render ở tiến trình khác"""
     stu = Student.query.get_or_404(student_id)
-    enrolls = Enrollment.query.filter_by(student_id=student_id).all()
+    enrolls = Enrollment.query.options(joinedload(Enrollment.course)) \
+        .filter_by(student_id=student_id).order_by(Enrollment.id).all()
+    gpa, creds = get_student_gpa(student_id)
+    return {
+        "student": {"id": stu.id, "code": stu.code, "full_name": stu.full_name,
+                    "class_name": stu.class_name},
+        "rows": [[e.course.code, e.course.name, e.course.credits, e.grade] for e in enrolls],
+        "gpa": gpa,
+        "credits": creds,
+    }
+
 
+def render_transcript_pdf(data):
+    """Vẽ PDF từ transcript_data() — không truy cập database"""
+    # ReportLab chỉ nạp khi thực sự render (không làm chậm khởi động worker)
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.units import cm
+
+    stu = data["student"]
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
@@ -16,9 +34,9 @@ def build_transcript_pdf(student_id: int):
     c.drawString(2*cm, height-2*cm, "BẢNG ĐIỂM - TRANSCRIPT")
 
     c.setFont("Helvetica", 11)
-    c.drawString(2*cm, height-3*cm, f"MSSV: {stu.code}")
-    c.drawString(2*cm, height-3.6*cm, f"Họ tên: {stu.full_name}")
-    c.drawString(2*cm, height-4.2*cm, f"Lớp: {stu.class_name or ''}")
+    c.drawString(2*cm, height-3*cm, f"MSSV: {stu['code']}")
+    c.drawString(2*cm, height-3.6*cm, f"Họ tên: {stu['full_name']}")
+    c.drawString(2*cm, height-4.2*cm, f"Lớp: {stu['class_name'] or ''}")
 
     y = height-5*cm
     c.setFont("Helvetica-Bold", 10)
@@ -29,23 +47,32 @@ def build_transcript_pdf(student_id: int):
     c.drawString(17*cm, y, "Điểm chữ")
     y -= 0.6*cm
     c.setFont("Helvetica", 10)
-    for e in enrolls:
-        letter, _ = grade_to_letter_and_gpa(e.grade)
-        c.drawString(2*cm, y, f"{e.course.code}")
-        c.drawString(5*cm, y, f"{e.course.name[:30]}")
-        c.drawRightString(14.5*cm, y, f"{e.course.credits}")
-        c.drawRightString(16.5*cm, y, f"{'' if e.grade is None else round(e.grade,1)}")
+    for code, name, credits, grade in data["rows"]:
+        letter, _ = grade_to_letter_and_gpa(grade)
+        c.drawString(2*cm, y, f"{code}")
+        c.drawString(5*cm, y, f"{name[:30]}")
+        c.drawRightString(14.5*cm, y, f"{credits}")
+        c.drawRightString(16.5*cm, y, f"{'' if grade is None else round(grade,1)}")
         c.drawRightString(19*cm, y, f"{letter or ''}")
         y -= 0.55*cm
         if y < 3*cm:
             c.showPage()
             y = height-2*cm
 
-    gpa, creds = compute_student_gpa(student_id)
     c.setFont("Helvetica-Bold", 11)
-    c.drawString(2*cm, 2.5*cm, f"Tổng số tín chỉ: {creds}   GPA (4.0): {gpa}")
+    c.drawString(2*cm, 2.5*cm, f"Tổng số tín chỉ: {data['credits']}   GPA (4.0): {data['gpa']}")
 
     c.showPage()
     c.save()
+    PDFS_RENDERED.inc()
     buffer.seek(0)
-    return buffer.getvalue(), f"transcript_{stu.code}.pdf"
+    return buffer.getvalue()
+
+
+def transcript_filename(data):
+    return f"transcript_{data['student']['code']}.pdf"
+
+
+def build_transcript_pdf(student_id: int):
+    data = transcript_data(student_id)
+    return render_transcript_pdf(data), transcript_filename(data)
@@ -0,0 +1,133 @@
+# app/utils/query_count.py
+import json
+import logging
+import time
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from ..extensions import db
+
+logger = logging.getLogger("app.sql")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Đếm số câu SQL thực sự gửi xuống database trong khối with"""
+    engine = engine if engine is not None else db.engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._before_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._before_execute)
+
+
+@contextmanager
+def query_budget(limit, engine=None, label=""):
+    """Báo lỗi nếu khối with phát sinh quá `limit` câu SQL (phát hiện N+1)"""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i}. {s.strip()[:200]}" for i, s in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(
+            f"{label or 'block'}: {counter.count} queries > budget {limit}\n{listing}"
+        )
+
+
+# ==========================
+# 📈 Thống kê SQL theo từng request
+# ==========================
+class RequestQueryStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = None
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time, self.slowest_sql = elapsed, statement
+
+    def as_dict(self):
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "slowest_ms": round(self.slowest_time * 1000, 2),
+            "slowest_sql": " ".join((self.slowest_sql or "").split())[:500],
+        }
+
+
+def current_query_stats():
+    if not has_request_context():
+        return None
+    return getattr(g, "_query_stats", None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def init_query_stats(app):
+    """
+    Ghi nhận số câu SQL, tổng thời gian DB và câu chậm nhất của mỗi request.
+    Request chậm hơn SLOW_REQUEST_MS (hoặc có câu SQL chậm hơn SLOW_QUERY_MS)
+    được ghi log dạng JSON vào logger "app.sql".
+    """
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_query_stats():
+        g._query_stats = RequestQueryStats()
+
+    @app.after_request
+    def _log_query_stats(response):
+        stats = current_query_stats()
+        if stats is None:
+            return response
+        duration = time.perf_counter() - stats.started
+        slow_request = duration * 1000 >= app.config["SLOW_REQUEST_MS"]
+        slow_query = stats.slowest_time * 1000 >= app.config["SLOW_QUERY_MS"]
+        if slow_request or slow_query:
+            logger.warning(json.dumps({
+                "event": "slow_request" if slow_request else "slow_query",
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "blueprint": request.blueprint,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 2),
+                **stats.as_dict(),
+            }, ensure_ascii=False))
+        return response
+
+    @app.context_processor
+    def _inject_query_stats():
+        return {"query_stats": current_query_stats()}
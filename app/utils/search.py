@@ -0,0 +1,180 @@
+# app/utils/search.py
+import re
+import unicodedata
+from sqlalchemy import event, inspect
+from flask_sqlalchemy.session import Session
+from ..extensions import db
+from ..models import Student
+
+CHUNK_SIZE = 1000
+
+# Các cột của Student được đưa vào chỉ mục tìm kiếm
+_FIELDS = ("full_name", "code", "email")
+
+# Engine đã có bảng chỉ mục (chỉ nhớ kết quả "có": tạo chỉ mục sau khi app chạy vẫn được dùng ngay)
+_available = set()
+
+
+# ==========================
+# 🔤 Chuẩn hóa tiếng Việt không dấu
+# ==========================
+def normalize(text):
+    """'Nguyễn Đức' -> 'nguyen duc' (bỏ dấu, đ -> d, chữ thường)"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFD", str(text))
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    return text.replace("đ", "d").replace("Đ", "D").lower()
+
+
+def _document(full_name, code, email):
+    return " ".join(normalize(v) for v in (full_name, code, email) if v)
+
+
+def _tokens(q):
+    return re.findall(r"\w+", normalize(q))
+
+
+# ==========================
+# 🗂️ Tạo / xây lại chỉ mục
+# ==========================
+def ensure_search_index(conn):
+    """
+    SQLite: bảng ảo FTS5 student_fts (rowid = student.id).
+    Backend khác: bảng student_search + chỉ mục trigram (PostgreSQL/pg_trgm).
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        conn.execute(db.text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts "
+            "USING fts5(document, tokenize='unicode61')"
+        ))
+    else:
+        conn.execute(db.text(
+            "CREATE TABLE IF NOT EXISTS student_search ("
+            "student_id INTEGER PRIMARY KEY REFERENCES student(id) ON DELETE CASCADE, "
+            "document TEXT NOT NULL)"
+        ))
+        if dialect == "postgresql":
+            conn.execute(db.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(db.text(
+                "CREATE INDEX IF NOT EXISTS ix_student_search_trgm "
+                "ON student_search USING gin (document gin_trgm_ops)"
+            ))
+    _available.discard(conn.engine.url)
+
+
+def _table(conn):
+    return "student_fts" if conn.dialect.name == "sqlite" else "student_search"
+
+
+def _key(conn):
+    return "rowid" if conn.dialect.name == "sqlite" else "student_id"
+
+
+def search_available(conn=None):
+    conn = conn if conn is not None else db.session.connection()
+    url = conn.engine.url
+    if url not in _available and inspect(conn).has_table(_table(conn)):
+        _available.add(url)
+    return url in _available
+
+
+def _write(conn, rows):
+    """rows: [(student_id, document)]"""
+    table, key = _table(conn), _key(conn)
+    ids = [r[0] for r in rows]
+    for i in range(0, len(ids), CHUNK_SIZE):
+        part = ids[i:i + CHUNK_SIZE]
+        conn.execute(db.text(f"DELETE FROM {table} WHERE {key} IN :ids")
+                     .bindparams(db.bindparam("ids", expanding=True)), {"ids": part})
+    docs = [{"id": sid, "doc": doc} for sid, doc in rows if doc is not None]
+    if docs:
+        conn.execute(db.text(f"INSERT INTO {table} ({key}, document) VALUES (:id, :doc)"), docs)
+
+
+def rebuild_search_index():
+    conn = db.session.connection()
+    ensure_search_index(conn)
+    conn.execute(db.text(f"DELETE FROM {_table(conn)}"))
+    rows = conn.execute(db.select(Student.id, Student.full_name, Student.code, Student.email))
+    n = 0
+    while True:
+        batch = rows.fetchmany(CHUNK_SIZE)
+        if not batch:
+            break
+        docs = [{"id": r.id, "doc": _document(r.full_name, r.code, r.email)} for r in batch]
+        conn.execute(db.text(
+            f"INSERT INTO {_table(conn)} ({_key(conn)}, document) VALUES (:id, :doc)"), docs)
+        n += len(docs)
+    if conn.dialect.name == "sqlite":
+        conn.execute(db.text("INSERT INTO student_fts(student_fts) VALUES ('optimize')"))
+    db.session.commit()
+    return n
+
+
+# ==========================
+# 🔎 Điều kiện tìm kiếm
+# ==========================
+def student_search_filter(q):
+    """
+    Trả về điều kiện lọc Student theo từ khóa (không phân biệt dấu).
+    SQLite: mỗi từ khóa là một truy vấn tiền tố FTS5 ("nguy"* AND "van"*);
+    từ khóa có chữ số còn được so LIKE với mã SV để "001" vẫn ra "SV001"
+    (FTS5 chỉ khớp đầu từ, tên thì không chứa số nên không phải quét thêm).
+    Backend khác: LIKE '%...%' trên văn bản đã chuẩn hóa (dùng chỉ mục trigram).
+    Nếu chưa có chỉ mục thì quay về ILIKE như trước.
+    """
+    conn = db.session.connection()
+    tokens = _tokens(q)
+    if not tokens or not search_available(conn):
+        like = f"%{q}%"
+        return (Student.full_name.ilike(like)) | (Student.code.ilike(like)) | (Student.email.ilike(like))
+
+    if conn.dialect.name == "sqlite":
+        match = " ".join(f'"{t}"*' for t in tokens)
+        ids = db.select(db.column("rowid", db.Integer)).select_from(db.table("student_fts")) \
+            .where(db.text("student_fts MATCH :match").bindparams(match=match))
+        if any(ch.isdigit() for ch in q):
+            # UNION trong câu con: quét chỉ mục mã SV thay vì cả bảng student;
+            # LIKE của SQLite vốn không phân biệt hoa thường với ASCII (ILIKE thêm lower() chậm gấp ~3)
+            ids = db.union(ids, db.select(Student.id).where(Student.code.like(f"%{q.strip()}%")))
+        return Student.id.in_(ids)
+
+    sub = db.select(db.column("student_id")).select_from(db.table("student_search"))
+    for i, t in enumerate(tokens):
+        sub = sub.where(db.column("document").like(db.bindparam(f"tok{i}", f"%{t}%")))
+    return Student.id.in_(sub)
+
+
+# ==========================
+# 🔁 Đồng bộ chỉ mục khi tạo / sửa / xóa sinh viên
+# ==========================
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, Student):
+            rows.append((obj.id, _document(obj.full_name, obj.code, obj.email)))
+    for obj in session.dirty:
+        if isinstance(obj, Student):
+            state = inspect(obj)
+            if any(state.attrs[f].history.has_changes() for f in _FIELDS):
+                rows.append((obj.id, _document(obj.full_name, obj.code, obj.email)))
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            rows.append((obj.id, None))
+
+    if rows:
+        conn = session.connection()
+        if search_available(conn):
+            _write(conn, rows)
+
+
+def register_search_commands(app):
+    @app.cli.command("reindex-students")
+    def reindex_students():
+        """Xây lại chỉ mục tìm kiếm sinh viên."""
+        with app.app_context():
+            n = rebuild_search_index()
+            print(f"✅ Đã lập chỉ mục {n} sinh viên.")
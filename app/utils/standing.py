@@ -0,0 +1,163 @@
+# app/utils/standing.py
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+import click
+from flask import current_app
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from ..extensions import db
+from ..models import Course, Enrollment, AcademicStanding, StandingQueue, grade_points_sql
+
+CHUNK_SIZE = 500
+
+
+@dataclass
+class StandingRun:
+    students: int   # số SV được tính lại (None: toàn bộ)
+    rows: int       # số dòng (SV, học kỳ) đã ghi
+    seconds: float
+
+
+# ==========================
+# ➕ Đánh dấu SV cần tính lại
+# ==========================
+def _upsert_queue(conn):
+    """INSERT ... ON CONFLICT (student_id): SV đã trong hàng đợi thì chỉ đổi queued_at"""
+    table = StandingQueue.__table__
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        module = sqlite if dialect == "sqlite" else postgresql
+        stmt = module.insert(table)
+        return stmt.on_conflict_do_update(index_elements=[table.c.student_id],
+                                          set_={"queued_at": stmt.excluded.queued_at})
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(queued_at=stmt.inserted.queued_at)
+    return None
+
+
+def queue_students(student_ids, conn=None):
+    """Ghi SV vào hàng đợi (trong transaction hiện tại) cho lần chạy job kế tiếp"""
+    conn = conn if conn is not None else db.session.connection()
+    now = datetime.utcnow()
+    rows = [{"student_id": sid, "queued_at": now} for sid in sorted(set(student_ids)) if sid is not None]
+    if not rows:
+        return 0
+    table = StandingQueue.__table__
+    upsert = _upsert_queue(conn)
+    for i in range(0, len(rows), CHUNK_SIZE):
+        part = rows[i:i + CHUNK_SIZE]
+        if upsert is None:  # backend khác: xóa rồi ghi lại trong cùng transaction
+            conn.execute(table.delete().where(table.c.student_id.in_([r["student_id"] for r in part])))
+        conn.execute(upsert if upsert is not None else table.insert(), part)
+    return len(rows)
+
+
+# ==========================
+# 🧮 GPA học kỳ / tích lũy + xếp loại bằng một câu INSERT ... SELECT
+# ==========================
+def _ratio(points, credits):
+    return db.case((credits > 0, db.func.round(points * 1.0 / credits, 2)), else_=0.0)
+
+
+def _standing_select(student_ids, now):
+    """
+    GROUP BY (SV, học kỳ) -> SUM() OVER theo học kỳ cho GPA tích lũy -> CASE xếp loại.
+    Học kỳ sắp theo chuỗi ("2024B" < "2025A"), đúng với cách đặt mã học kỳ hiện tại.
+    """
+    cfg = current_app.config
+    semester = db.func.coalesce(Enrollment.semester, "")
+    terms = db.select(
+        Enrollment.student_id.label("student_id"),
+        semester.label("semester"),
+        db.func.sum(grade_points_sql(Enrollment.grade) * Course.credits).label("points"),
+        db.func.sum(Course.credits).label("credits"),
+    ).join(Course, Enrollment.course_id == Course.id) \
+     .where(Enrollment.grade.isnot(None)) \
+     .group_by(Enrollment.student_id, semester)
+    if student_ids is not None:
+        terms = terms.where(Enrollment.student_id.in_(student_ids))
+    terms = terms.subquery()
+
+    window = {"partition_by": terms.c.student_id, "order_by": terms.c.semester}
+    running = db.select(
+        terms.c.student_id, terms.c.semester, terms.c.points, terms.c.credits,
+        db.func.sum(terms.c.points).over(**window).label("cum_points"),
+        db.func.sum(terms.c.credits).over(**window).label("cum_credits"),
+    ).subquery()
+
+    term_gpa = _ratio(running.c.points, running.c.credits)
+    cumulative_gpa = _ratio(running.c.cum_points, running.c.cum_credits)
+    standing = db.case(
+        ((cumulative_gpa < cfg["STANDING_PROBATION_GPA"])
+         | (term_gpa < cfg["STANDING_PROBATION_TERM_GPA"]), AcademicStanding.PROBATION),
+        ((term_gpa >= cfg["STANDING_DEANS_LIST_GPA"])
+         & (running.c.credits >= cfg["STANDING_DEANS_LIST_MIN_CREDITS"]), AcademicStanding.DEANS_LIST),
+        else_=AcademicStanding.GOOD,
+    )
+    return db.select(
+        running.c.student_id, running.c.semester,
+        term_gpa, running.c.credits, cumulative_gpa, running.c.cum_credits,
+        standing, db.literal(now, db.DateTime),
+    )
+
+
+_COLUMNS = ["student_id", "semester", "term_gpa", "term_credits",
+            "cumulative_gpa", "cumulative_credits", "standing", "computed_at"]
+
+
+def _write(conn, student_ids, now):
+    table = AcademicStanding.__table__
+    delete = table.delete()
+    if student_ids is not None:
+        delete = delete.where(table.c.student_id.in_(student_ids))
+    conn.execute(delete)
+    return conn.execute(table.insert().from_select(_COLUMNS, _standing_select(student_ids, now))).rowcount
+
+
+def compute_standing(full=False):
+    """
+    Tính lại kết quả học kỳ cho các SV trong hàng đợi (full / bảng còn trống: toàn bộ SV).
+    Chỉ xóa các dòng hàng đợi xếp trước lúc bắt đầu: SV sửa điểm trong lúc chạy
+    (queued_at mới hơn) được giữ lại cho lần sau.
+    Cần chạy định kỳ (cron / systemd timer), hàng đợi chỉ được dọn khi job chạy.
+    """
+    t0 = time.perf_counter()
+    now = datetime.utcnow()
+    conn = db.session.connection()
+    queue = StandingQueue.__table__
+    ids = [sid for (sid,) in conn.execute(db.select(queue.c.student_id).order_by(queue.c.student_id))]
+    full = full or conn.execute(db.select(AcademicStanding.student_id).limit(1)).first() is None
+
+    if full:
+        students, rows = None, _write(conn, None, now)
+    else:
+        students, rows = len(ids), 0
+        for i in range(0, len(ids), CHUNK_SIZE):
+            rows += _write(conn, ids[i:i + CHUNK_SIZE], now)
+
+    for i in range(0, len(ids), CHUNK_SIZE):
+        conn.execute(queue.delete().where(queue.c.student_id.in_(ids[i:i + CHUNK_SIZE]),
+                                          queue.c.queued_at <= now))
+    db.session.commit()
+    return StandingRun(students=students, rows=rows, seconds=round(time.perf_counter() - t0, 3))
+
+
+def register_standing_commands(app):
+    @app.cli.command("compute-standing")
+    @click.option("--all", "full", is_flag=True, help="Tính lại toàn bộ SV thay vì chỉ SV có điểm thay đổi.")
+    def compute_standing_command(full):
+        """GPA học kỳ, GPA tích lũy và xếp loại (cảnh báo / khen thưởng) sau mỗi đợt nhập điểm."""
+        with app.app_context():
+            run = compute_standing(full)
+            who = "toàn bộ SV" if run.students is None else f"{run.students} SV có điểm thay đổi"
+            print(f"✅ Đã tính lại {who}: {run.rows} dòng (SV, học kỳ) trong {run.seconds:.2f}s.")
+
+            latest = db.session.query(db.func.max(AcademicStanding.semester)).scalar()
+            if latest:
+                counts = Counter(dict(db.session.query(AcademicStanding.standing, db.func.count())
+                                      .filter(AcademicStanding.semester == latest)
+                                      .group_by(AcademicStanding.standing)))
+                print(f"   Học kỳ {latest}: {counts[AcademicStanding.PROBATION]} cảnh báo học vụ, "
+                      f"{counts[AcademicStanding.DEANS_LIST]} khen thưởng, {counts[AcademicStanding.GOOD]} bình thường.")
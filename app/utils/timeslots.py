@@ -0,0 +1,100 @@
+# app/utils/timeslots.py
+import re
+from ..extensions import db
+
+# ==========================
+# 🗓️ Thứ trong tuần (ISO: 1 = Thứ Hai ... 7 = Chủ Nhật)
+# ==========================
+WEEKDAY_NAMES = {1: "Thứ Hai", 2: "Thứ Ba", 3: "Thứ Tư", 4: "Thứ Năm",
+                 5: "Thứ Sáu", 6: "Thứ Bảy", 7: "Chủ Nhật"}
+
+_WEEKDAY_ALIASES = {
+    "hai": 1, "t2": 1, "monday": 1, "mon": 1,
+    "ba": 2, "t3": 2, "tuesday": 2, "tue": 2,
+    "tu": 3, "t4": 3, "wednesday": 3, "wed": 3,
+    "nam": 4, "t5": 4, "thursday": 4, "thu": 4,
+    "sau": 5, "t6": 5, "friday": 5, "fri": 5,
+    "bay": 6, "t7": 6, "saturday": 6, "sat": 6,
+    "chu nhat": 7, "cn": 7, "sunday": 7, "sun": 7,
+}
+
+_TIME = r"(\d{1,2})\s*(?:[:hg]\s*(\d{2})?)?"
+_RANGE_RE = re.compile(rf"^\s*{_TIME}\s*(?:-|–|—|đến|den|to)\s*{_TIME}\s*$", re.IGNORECASE)
+
+
+def parse_weekday(value):
+    """'Thứ Hai' / 'Thứ 2' / 'T2' / 'CN' -> 1..7; '1'..'7' (giá trị ô chọn) giữ nguyên; sai -> None"""
+    from .search import normalize  # search import models -> import muộn tránh vòng lặp
+
+    text = normalize(str(value or "")).strip()
+    if text.isdigit():
+        return int(text) if 1 <= int(text) <= 7 else None
+    m = re.fullmatch(r"thu\s*([2-8])", text)
+    if m:
+        return int(m.group(1)) - 1  # "Thứ 2" = thứ Hai ... "Thứ 8" = Chủ Nhật
+    return _WEEKDAY_ALIASES.get(re.sub(r"^thu\s+", "", text))
+
+
+def parse_clock(value):
+    """'07:30' -> 450 (phút tính từ 0h)"""
+    m = re.fullmatch(_TIME, (value or "").strip(), re.IGNORECASE)
+    if not m:
+        return None
+    hour, minute = int(m.group(1)), int(m.group(2) or 0)
+    return hour * 60 + minute if hour < 24 and minute < 60 else None
+
+
+def parse_time_range(value):
+    """'07:30 - 09:30' / '7h30-9h30' -> (450, 570); sai định dạng hoặc kết thúc <= bắt đầu -> None"""
+    m = _RANGE_RE.match(value or "")
+    if not m:
+        return None
+    h1, m1, h2, m2 = (int(g or 0) for g in m.groups())
+    if h1 > 23 or h2 > 24 or m1 > 59 or m2 > 59:
+        return None
+    start, end = h1 * 60 + m1, h2 * 60 + m2
+    return (start, end) if end > start else None
+
+
+def format_minutes(minutes):
+    return "" if minutes is None else f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def current_semester():
+    """Học kỳ mới nhất có ghi danh ("2025B" > "2025A" > "2024B" theo thứ tự chuỗi)"""
+    from ..models import Enrollment
+
+    return db.session.query(db.func.max(Enrollment.semester)).scalar()
+
+
+# ==========================
+# 🚪 Kiểm tra trùng phòng
+# ==========================
+_conflict_stmt = None
+
+
+def _conflict_statement():
+    """Dựng một lần: tạo biểu thức SQL tốn hơn cả chạy câu truy vấn qua chỉ mục"""
+    global _conflict_stmt
+    if _conflict_stmt is None:
+        from ..models import Schedule
+
+        _conflict_stmt = db.select(Schedule).where(
+            Schedule.room == db.bindparam("room"),
+            Schedule.weekday == db.bindparam("weekday"),
+            Schedule.start_minute < db.bindparam("end"),
+            Schedule.end_minute > db.bindparam("start"),
+            Schedule.id != db.bindparam("exclude_id"),
+        ).order_by(Schedule.start_minute)
+    return _conflict_stmt
+
+
+def find_room_conflicts(room, weekday, start, end, exclude_id=None):
+    """
+    Các buổi học cùng phòng, cùng thứ có khoảng [start, end) giao nhau.
+    Chỉ mục (room, weekday, start_minute) giới hạn việc duyệt trong các buổi của
+    đúng phòng/thứ đó có start_minute < end -> chi phí không phụ thuộc tổng số buổi.
+    """
+    params = {"room": room, "weekday": weekday, "start": start, "end": end,
+              "exclude_id": exclude_id or 0}
+    return db.session.scalars(_conflict_statement(), params).all()
@@ -0,0 +1,139 @@
+# app/utils/timetable.py
+from dataclasses import dataclass, replace
+from itertools import product
+from flask import current_app
+from sqlalchemy import event, inspect
+from flask_sqlalchemy.session import Session
+from ..extensions import db
+from ..models import Course, Enrollment, Schedule
+from .cache import TTLCache, invalidate_on_commit, invalidate_after_commit, invalidate_keys_after_commit
+from .timeslots import WEEKDAY_NAMES, format_minutes, current_semester
+
+# Thay đổi ở các cột này của Enrollment làm TKB của sinh viên thay đổi (điểm thì không)
+_ENROLL_FIELDS = ("student_id", "course_id", "semester")
+
+timetable_cache = TTLCache("timetable")
+# Sửa TKB / tên học phần ảnh hưởng mọi SV của học phần đó -> xóa cả cache (hiếm khi xảy ra)
+invalidate_on_commit(timetable_cache, Schedule, Course)
+
+
+@dataclass(frozen=True)
+class TimetableEntry:
+    schedule_id: int
+    course_code: str
+    course_name: str
+    weekday: int
+    start_minute: int
+    end_minute: int
+    room: str
+    clash: bool = False  # trùng giờ với một buổi khác của chính SV này
+
+    @property
+    def weekday_name(self):
+        return WEEKDAY_NAMES.get(self.weekday, "")
+
+    @property
+    def time_range(self):
+        return f"{format_minutes(self.start_minute)} - {format_minutes(self.end_minute)}"
+
+
+@dataclass(frozen=True)
+class Timetable:
+    semester: str
+    entries: tuple   # TimetableEntry, theo (thứ, giờ bắt đầu)
+    clashes: tuple   # (TimetableEntry, TimetableEntry) trùng giờ
+
+
+# ==========================
+# 📅 Dựng TKB cá nhân
+# ==========================
+def _find_clashes(entries):
+    """Quét theo từng thứ: buổi sau bắt đầu trước khi buổi đang mở kết thúc -> trùng"""
+    clashes, active, day = [], [], None
+    for e in entries:  # đã sắp theo (weekday, start_minute)
+        if e.weekday is None or e.start_minute is None or e.end_minute is None:
+            continue
+        if e.weekday != day:
+            active, day = [], e.weekday
+        active = [a for a in active if a.end_minute > e.start_minute]
+        clashes.extend((a, e) for a in active)
+        active.append(e)
+    return clashes
+
+
+def build_timetable(student_id, semester=None):
+    """Một truy vấn join Enrollment (mặc định học kỳ hiện tại) -> Schedule -> Course"""
+    semester = semester or current_semester()
+    rows = db.session.execute(
+        db.select(Schedule.id, Course.code, Course.name, Schedule.weekday,
+                  Schedule.start_minute, Schedule.end_minute, Schedule.room)
+        .join(Course, Schedule.course_id == Course.id)
+        .join(Enrollment, Enrollment.course_id == Course.id)
+        .where(Enrollment.student_id == student_id, Enrollment.semester == semester)
+        .order_by(Schedule.weekday, Schedule.start_minute, Course.code)
+    ).all()
+    entries = [TimetableEntry(*r) for r in rows]
+    pairs = _find_clashes(entries)
+    clashed = {e.schedule_id for pair in pairs for e in pair}
+    entries = [replace(e, clash=True) if e.schedule_id in clashed else e for e in entries]
+    by_id = {e.schedule_id: e for e in entries}
+    return Timetable(
+        semester=semester,
+        entries=tuple(entries),
+        clashes=tuple((by_id[a.schedule_id], by_id[b.schedule_id]) for a, b in pairs),
+    )
+
+
+def student_timetable(student_id):
+    """TKB cá nhân lấy từ cache của worker (TIMETABLE_CACHE_TTL = 0: luôn dựng mới)"""
+    ttl = current_app.config["TIMETABLE_CACHE_TTL"]
+    if ttl <= 0:
+        return build_timetable(student_id)
+    # Khóa gồm cả học kỳ: sang học kỳ mới thì mọi TKB cũ tự hết hiệu lực
+    semester = timetable_cache.get_or_set("semester", current_semester, ttl=ttl)
+    return timetable_cache.get_or_set((student_id, semester),
+                                      lambda: build_timetable(student_id, semester), ttl=ttl)
+
+
+# ==========================
+# 🧹 Xóa cache đúng những SV có ghi danh thay đổi
+# ==========================
+@event.listens_for(Session, "after_flush")
+def _track_enrollments(session, flush_context):
+    keys = set()
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Enrollment):
+            keys.add((obj.student_id, obj.semester))
+    for obj in session.dirty:
+        if isinstance(obj, Enrollment):
+            state = inspect(obj)
+            if any(state.attrs[f].history.has_changes() for f in _ENROLL_FIELDS):
+                # Chuyển sang SV / học kỳ khác: xóa cả TKB cũ lẫn mới
+                students = {obj.student_id, *state.attrs.student_id.history.deleted}
+                semesters = {obj.semester, *state.attrs.semester.history.deleted}
+                keys.update(product(students, semesters))
+    if keys:
+        # Ghi danh đầu tiên / cuối cùng của một học kỳ có thể đổi học kỳ hiện tại
+        invalidate_keys_after_commit(session, timetable_cache, keys | {"semester"})
+
+
+def _bulk_update_columns(orm_execute_state):
+    """Tên các cột một lệnh UPDATE theo lô ghi vào (.values(...) hoặc danh sách dict theo khóa chính)"""
+    columns = {getattr(k, "key", k) for k in (getattr(orm_execute_state.statement, "_values", None) or {})}
+    params = orm_execute_state.parameters
+    for row in ([params] if isinstance(params, dict) else params or []):
+        columns.update(row)
+    return columns
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_enrollments(orm_execute_state):
+    # Ghi danh theo lô (import điểm, seed) không biết SV nào -> xóa cả cache;
+    # UPDATE chỉ sửa điểm (import điểm, /api/v1/enrollments:batch) thì giữ nguyên
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None or mapper.class_ is not Enrollment:
+            return
+        if orm_execute_state.is_update and not set(_ENROLL_FIELDS) & _bulk_update_columns(orm_execute_state):
+            return
+        invalidate_after_commit(orm_execute_state.session, timetable_cache)
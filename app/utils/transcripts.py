@@ -0,0 +1,160 @@
+# app/utils/transcripts.py
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import click
+from flask import current_app
+from ..extensions import db
+from ..models import Student, Course, Enrollment, StudentGpa, compute_student_gpa
+from .pdf import transcript_data, render_transcript_pdf, transcript_filename
+
+
+# ==========================
+# 🗄️ Cache PDF trên đĩa (instance/transcripts/<student_id>/<hash>.pdf)
+# ==========================
+def _cache_dir():
+    return current_app.config.get("TRANSCRIPT_CACHE_DIR") or \
+        os.path.join(current_app.instance_path, "transcripts")
+
+
+def content_hash(data):
+    """Băm toàn bộ nội dung in ra: đổi điểm, tín chỉ, tên HP, thông tin SV... đều đổi hash"""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _cache_path(data):
+    folder = os.path.join(_cache_dir(), str(data["student"]["id"]))
+    return folder, os.path.join(folder, f"{content_hash(data)}.pdf")
+
+
+def _prune(folder, keep):
+    """
+    Xóa các bản cũ (hash khác) không được ghi / dùng trong TRANSCRIPT_CACHE_KEEP_SECONDS.
+    Không xóa ngay: request song song có thể vẫn đang gửi bản vừa bị thay thế.
+    """
+    cutoff = time.time() - current_app.config["TRANSCRIPT_CACHE_KEEP_SECONDS"]
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        # *.tmp cũ: bản ghi dở của tiến trình đã chết giữa chừng
+        if name.endswith((".pdf", ".tmp")) and path != keep:
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def store_transcript(data, pdf_bytes):
+    folder, path = _cache_path(data)
+    os.makedirs(folder, exist_ok=True)
+    # Tên tạm riêng cho mỗi lần ghi: nhiều thread cùng worker có thể render cùng một bảng điểm
+    with tempfile.NamedTemporaryFile(dir=folder, suffix=".tmp", delete=False) as f:
+        f.write(pdf_bytes)
+    os.replace(f.name, path)  # ghi nguyên tử, request khác không đọc phải file dở
+    _prune(folder, path)
+    return path
+
+
+def _read_cached(path):
+    """Nội dung PDF trong cache (None nếu chưa có / vừa bị dọn); chạm mtime để bản đang dùng không bị dọn"""
+    try:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        os.utime(path)
+        return pdf_bytes
+    except FileNotFoundError:
+        return None
+
+
+def transcript_file(student_id: int):
+    """Trả về (file PDF đã mở, tên file); chỉ render lại khi nội dung bảng điểm thay đổi"""
+    data = transcript_data(student_id)
+    _, path = _cache_path(data)
+    pdf_bytes = _read_cached(path)
+    if pdf_bytes is None:
+        pdf_bytes = render_transcript_pdf(data)
+        store_transcript(data, pdf_bytes)
+    # Gửi từ bộ nhớ: không phụ thuộc file còn trên đĩa lúc gửi
+    return io.BytesIO(pdf_bytes), transcript_filename(data)
+
+
+# ==========================
+# 🏭 Render cả lớp song song
+# ==========================
+def class_transcript_data(class_name):
+    """Dữ liệu bảng điểm của cả lớp bằng 3 truy vấn (SV, JOIN điểm/HP, GPA)"""
+    students = Student.query.filter_by(class_name=class_name).order_by(Student.code).all()
+    ids = [s.id for s in students]
+    if not ids:
+        return []
+
+    rows = {sid: [] for sid in ids}
+    gpas = {}
+    for i in range(0, len(ids), 500):
+        part = ids[i:i + 500]
+        for r in db.session.query(
+            Enrollment.student_id, Course.code, Course.name, Course.credits, Enrollment.grade,
+        ).join(Course, Enrollment.course_id == Course.id) \
+         .filter(Enrollment.student_id.in_(part)).order_by(Enrollment.id):
+            rows[r.student_id].append([r.code, r.name, r.credits, r.grade])
+        for g in db.session.query(StudentGpa.student_id, StudentGpa.gpa, StudentGpa.total_credits) \
+                .filter(StudentGpa.student_id.in_(part)):
+            gpas[g.student_id] = (g.gpa, g.total_credits)
+
+    result = []
+    for s in students:
+        gpa, creds = gpas.get(s.id) or compute_student_gpa(s.id)
+        result.append({
+            "student": {"id": s.id, "code": s.code, "full_name": s.full_name,
+                        "class_name": s.class_name},
+            "rows": rows[s.id],
+            "gpa": gpa,
+            "credits": creds,
+        })
+    return result
+
+
+def build_class_zip(class_name, output, workers=None):
+    """Ghi file zip bảng điểm cả lớp; trả về (số SV, số PDF phải render mới)"""
+    items = class_transcript_data(class_name)
+    todo = [d for d in items if not os.path.exists(_cache_path(d)[1])]
+
+    rendered = {}
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for data, pdf_bytes in zip(todo, pool.map(render_transcript_pdf, todo, chunksize=16)):
+                store_transcript(data, pdf_bytes)
+                rendered[data["student"]["id"]] = pdf_bytes
+
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+        for data in items:
+            pdf_bytes = rendered.get(data["student"]["id"]) or _read_cached(_cache_path(data)[1])
+            if pdf_bytes is None:  # bị dọn giữa chừng: render lại tại chỗ
+                pdf_bytes = render_transcript_pdf(data)
+                store_transcript(data, pdf_bytes)
+            zf.writestr(transcript_filename(data), pdf_bytes)
+    return len(items), len(todo)
+
+
+def register_transcript_commands(app):
+    @app.cli.command("transcripts")
+    @click.option("--class", "class_name", required=True, help="Mã lớp, ví dụ DTS1.")
+    @click.option("--output", "-o", default=None, help="File zip đầu ra.")
+    @click.option("--workers", type=int, default=None, help="Số tiến trình render (mặc định = số CPU).")
+    def transcripts(class_name, output, workers):
+        """Xuất bảng điểm PDF của cả lớp thành một file zip."""
+        output = output or f"transcripts_{class_name}.zip"
+        with app.app_context():
+            t0 = time.perf_counter()
+            total, rendered = build_class_zip(class_name, output, workers)
+            if not total:
+                print(f"⚠️ Không có sinh viên nào trong lớp {class_name}.")
+                return
+            print(f"✅ {total} bảng điểm ({rendered} render mới, {total - rendered} từ cache) "
+                  f"-> {output} ({time.perf_counter() - t0:.1f}s)")
@@ -0,0 +1,59 @@
+"""
+Xếp hạng / so sánh lớp cho toàn trường: gọi compute_student_gpa từng SV (vòng lặp Python,
+đo trên một mẫu rồi nội suy) so với compute_cohort_report (một truy vấn cột + numpy).
+
+Chạy:  python -m benchmarks.bench_analytics --students 100000 --sample 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_analytics.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import compute_student_gpa  # noqa: E402
+from app.seed_bulk import generate, _insert  # noqa: E402
+from app.utils.analytics import _fetch, compute_cohort_report  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--courses", type=int, default=1500)
+    parser.add_argument("--sample", type=int, default=2000, help="Số SV đo vòng lặp compute_student_gpa.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        data = generate(random.Random(42), args.students, args.courses, args.students * 20, 2025)
+        for model, rows in data.items():
+            _insert(model, rows)
+        db.session.commit()
+
+        sample = random.Random(1).sample(range(1, args.students + 1), min(args.sample, args.students))
+        t0 = time.perf_counter()
+        for sid in sample:
+            compute_student_gpa(sid)
+        loop = (time.perf_counter() - t0) / len(sample) * args.students
+        db.session.rollback()
+
+        compute_cohort_report()  # nạp numpy / pandas
+        t0 = time.perf_counter()
+        _fetch(db.session.connection())
+        fetch = time.perf_counter() - t0
+        report = compute_cohort_report()
+
+    print(f"{args.students:,} SV, {report.rows:,} ghi danh có điểm, {len(report.terms):,} (SV, học kỳ)")
+    print(f"  compute_student_gpa x {args.students:,} (nội suy)  {loop:>7.2f}s  (chỉ GPA tích lũy)")
+    print(f"  compute_cohort_report                 {report.seconds:>7.2f}s  "
+          f"(đọc DB {fetch:.2f}s + numpy {report.seconds - fetch:.2f}s; "
+          f"GPA học kỳ/tích lũy, hạng, thống kê {len(report.courses):,} nhóm học phần)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Tải đồng thời trên SQLite: nhiều tiến trình (giống worker gunicorn) vừa đọc vừa ghi
+cùng một file database. So sánh cấu hình cũ (journal DELETE, synchronous FULL)
+với cấu hình mới (WAL + synchronous NORMAL + busy_timeout).
+
+Chạy:  python -m benchmarks.bench_concurrency --workers 8 --seconds 10 --write-ratio 0.2
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+MODES = {
+    "baseline": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL"},
+    "tuned": {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL"},
+}
+
+
+def _setup_env(db_path, mode):
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.update(MODES[mode])
+
+
+def seed(db_path, mode, students, courses):
+    _setup_env(db_path, mode)
+    from app import create_app
+    from app.extensions import db
+    from app.models import Student, Course, Enrollment
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Student), [
+            {"code": f"SV{i:06d}", "full_name": f"Sinh viên {i}",
+             "email": f"sv{i}@st.example.edu.vn", "class_name": f"DTS{i % 20}"}
+            for i in range(students)])
+        db.session.execute(db.insert(Course), [
+            {"code": f"HP{i:03d}", "name": f"Học phần {i}", "credits": 3} for i in range(courses)])
+        db.session.commit()
+        db.session.execute(db.insert(Enrollment), [
+            {"student_id": s + 1, "course_id": c + 1, "grade": 7.0}
+            for s in range(students) for c in range(0, courses, 3)])
+        db.session.commit()
+
+
+def worker(db_path, mode, seconds, write_ratio, students, seed_value, out):
+    _setup_env(db_path, mode)
+    from sqlalchemy import func
+    from sqlalchemy.exc import OperationalError
+    from app import create_app
+    from app.extensions import db
+    from app.models import Student, Course, Enrollment
+
+    app = create_app()
+    rnd = random.Random(seed_value)
+    stats = {"reads": 0, "writes": 0, "locked": 0, "latencies": []}
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sid = rnd.randint(1, students)
+        is_write = rnd.random() < write_ratio
+        t0 = time.perf_counter()
+        with app.app_context():
+            try:
+                if is_write:
+                    # Giống route sửa điểm: đọc bản ghi rồi ghi trong cùng transaction
+                    enr = Enrollment.query.filter_by(student_id=sid).first()
+                    enr.grade = round(rnd.uniform(0, 10), 1)
+                    db.session.commit()
+                    stats["writes"] += 1
+                else:
+                    db.session.query(Enrollment.grade, Course.code) \
+                        .join(Course, Enrollment.course_id == Course.id) \
+                        .filter(Enrollment.student_id == sid).all()
+                    db.session.query(func.count(Student.id)).scalar()
+                    stats["reads"] += 1
+            except OperationalError as exc:
+                db.session.rollback()
+                if "locked" not in str(exc) and "busy" not in str(exc):
+                    raise
+                stats["locked"] += 1
+        stats["latencies"].append((time.perf_counter() - t0) * 1000)
+    out.put(stats)
+
+
+def run_mode(mode, args):
+    db_path = os.path.join(tempfile.mkdtemp(), f"bench_{mode}.db")
+    # Config đọc biến môi trường lúc import -> mỗi chế độ chạy trong tiến trình mới
+    ctx = mp.get_context("spawn")
+    p = ctx.Process(target=seed, args=(db_path, mode, args.students, args.courses))
+    p.start()
+    p.join()
+
+    out = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(db_path, mode, args.seconds, args.write_ratio,
+                                               args.students, i, out))
+             for i in range(args.workers)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    reads = sum(r["reads"] for r in results)
+    writes = sum(r["writes"] for r in results)
+    locked = sum(r["locked"] for r in results)
+    lat = sorted(x for r in results for x in r["latencies"])
+    p95 = lat[int(len(lat) * 0.95)] if lat else 0
+    print(f"{mode:<9} {reads / args.seconds:>9.0f} {writes / args.seconds:>9.0f} "
+          f"{locked:>7} {p95:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--courses", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.seconds:.0f}s, {args.write_ratio:.0%} writes\n")
+    print(f"{'mode':<9} {'reads/s':>9} {'writes/s':>9} {'locked':>7} {'p95 ms':>9}")
+    for mode in MODES:
+        run_mode(mode, args)
+
+
+if __name__ == "__main__":
+    main()
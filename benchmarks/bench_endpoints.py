@@ -0,0 +1,222 @@
+"""
+Bộ benchmark các endpoint nóng qua Flask test client, trên dữ liệu sinh bởi seed-bulk
+ở nhiều kích thước. Mỗi endpoint ghi lại p50/p95 (ms), số câu SQL mỗi request và bộ
+nhớ Python cấp phát đỉnh (tracemalloc), rồi so với baseline JSON:
+p50/bộ nhớ vượt baseline quá --tolerance (p95: gấp đôi tolerance) hoặc số câu SQL
+tăng -> thoát với mã 1. Baseline phụ thuộc máy đo: đổi máy thì ghi lại baseline.
+
+Chạy:  python -m benchmarks.bench_endpoints                 # so với benchmarks/baseline.json
+       python -m benchmarks.bench_endpoints --save-baseline # ghi lại baseline
+       python -m benchmarks.bench_endpoints --sizes small --repeat 5
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import queue
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# tên -> (số SV, số học phần, số ghi danh mỗi SV)
+SIZES = {
+    "small": (1000, 60, 15),
+    "medium": (5000, 150, 20),
+    "large": (20000, 300, 20),
+}
+
+# tên -> (method, url, số lần lặp tối đa); url có thể chứa {i} (lần lặp thứ i)
+ENDPOINTS = {
+    "dashboard": ("GET", "/", None),
+    "students_search": ("GET", "/students/?q=nguyen van", None),
+    "courses": ("GET", "/courses/", None),
+    "enrollments": ("GET", "/enrollments/", None),
+    "export_xlsx": ("GET", "/enrollments/export", 3),
+    "export_csv": ("GET", "/enrollments/export?format=csv", 5),
+    "upload": ("POST", "/enrollments/upload", 5),
+    # Mỗi lần một SV khác -> luôn render mới (không trúng cache PDF)
+    "transcript_pdf": ("GET", "/enrollments/transcript/{i}.pdf", None),
+}
+
+UPLOAD_ROWS = 500
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _upload_files(rows, count):
+    """File xlsx import điểm; mỗi lần lặp đổi điểm để luôn có bản ghi được cập nhật"""
+    from openpyxl import Workbook
+    files = []
+    for i in range(count):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("grades")
+        ws.append(["student_code", "course_code", "semester", "grade"])
+        for code, course, semester, grade in rows:
+            ws.append([code, course, semester, round(((grade or 5.0) + 0.1 * (i + 1)) % 10, 1)])
+        buf = BytesIO()
+        wb.save(buf)
+        files.append(buf.getvalue())
+    return files
+
+
+def run_size(size, repeat, out):
+    """Chạy trong tiến trình riêng: Config đọc SQLALCHEMY_DATABASE_URI lúc import"""
+    tmp = tempfile.mkdtemp()
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ["TRANSCRIPT_CACHE_DIR"] = os.path.join(tmp, "transcripts")
+
+    import random
+    from flask_migrate import upgrade
+    from app import create_app
+    from app.extensions import db
+    from app.models import User, Role, Student, Course, Enrollment
+    from app.seed_bulk import generate, _insert
+    from app.utils.gpa import rebuild_all_gpa
+    from app.utils.search import rebuild_search_index
+    from app.utils.query_count import count_queries
+
+    n_students, n_courses, per_student = SIZES[size]
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        upgrade(directory=os.path.join(ROOT, "migrations"))
+        data = generate(random.Random(42), n_students, n_courses, n_students * per_student, 2025)
+        for model, rows in data.items():
+            _insert(model, rows)
+        admin = User(email="admin@demo.com", role=Role.ADMIN)
+        admin.set_password("123456")
+        db.session.add(admin)
+        db.session.commit()
+        rebuild_all_gpa()
+        rebuild_search_index()
+        sample = db.session.query(Student.code, Course.code, Enrollment.semester, Enrollment.grade) \
+            .join(Student, Enrollment.student_id == Student.id) \
+            .join(Course, Enrollment.course_id == Course.id) \
+            .order_by(Enrollment.id).limit(UPLOAD_ROWS).all()
+        engine = db.engine
+    uploads = _upload_files(sample, repeat + 2)
+
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@demo.com", "password": "123456"})
+
+    def call(method, url, i):
+        if method == "POST":
+            return client.post(url, data={"file": (BytesIO(uploads[i]), "grades.xlsx")},
+                               content_type="multipart/form-data")
+        resp = client.get(url.format(i=i + 1))
+        resp.get_data()  # đọc hết body (CSV được stream)
+        return resp
+
+    results = {}
+    for name, (method, url, cap) in ENDPOINTS.items():
+        n = min(repeat, cap or repeat)
+        call(method, url, 0)  # làm nóng: nạp thư viện, cache template
+        latencies, queries = [], []
+        for i in range(1, n + 1):
+            with count_queries(engine) as counter:
+                t0 = time.perf_counter()
+                resp = call(method, url, i)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            if resp.status_code != 200:
+                raise RuntimeError(f"{name}: HTTP {resp.status_code}")
+            queries.append(counter.count)
+
+        tracemalloc.start()
+        call(method, url, n + 1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[name] = {
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "queries": max(queries),
+            "peak_mb": round(peak / 2 ** 20, 2),
+        }
+    out.put((size, results))
+
+
+def compare(current, baseline, tolerance):
+    """Danh sách dòng mô tả regression (rỗng nếu không có)"""
+    problems = []
+    for size, endpoints in current.items():
+        for name, cur in endpoints.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            # p95 dao động mạnh hơn nhiều -> nới gấp đôi; bỏ qua chênh lệch < 5 ms / < 1 MB
+            for key, tol, floor in (("p50_ms", tolerance, 5.0), ("p95_ms", 2 * tolerance, 5.0),
+                                    ("peak_mb", tolerance, 1.0)):
+                if cur[key] > max(base[key] * (1 + tol), base[key] + floor):
+                    problems.append(f"{size}/{name}: {key} {cur[key]} > baseline {base[key]}")
+            if cur["queries"] > base["queries"]:
+                problems.append(f"{size}/{name}: queries {cur['queries']} > baseline {base['queries']}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="small,medium", help=f"Trong số: {', '.join(SIZES)}.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Cho phép chậm / tốn bộ nhớ hơn baseline bao nhiêu (0.5 = 50%%).")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    current = {}
+    for size in args.sizes.split(","):
+        out = ctx.Queue()
+        p = ctx.Process(target=run_size, args=(size, args.repeat, out))
+        p.start()
+        while True:
+            try:
+                name, results = out.get(timeout=5)
+                break
+            except queue.Empty:
+                if not p.is_alive():
+                    sys.exit(f"❌ {size}: tiến trình benchmark dừng lỗi (exit {p.exitcode})")
+        p.join()
+        current[name] = results
+
+        n_students, n_courses, per_student = SIZES[size]
+        print(f"\n{size}: {n_students} SV, {n_courses} HP, {n_students * per_student} ghi danh")
+        print(f"  {'endpoint':<17} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak MB':>8}")
+        for ep, r in results.items():
+            print(f"  {ep:<17} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['queries']:>8} {r['peak_mb']:>8.1f}")
+
+    if args.save_baseline:
+        meta = {"python": platform.python_version(), "machine": platform.machine(),
+                "cpus": os.cpu_count(), "repeat": args.repeat}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, **current}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n💾 Đã ghi baseline: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ Chưa có baseline ({args.baseline}); chạy lại với --save-baseline.")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = compare(current, baseline, args.tolerance)
+    if problems:
+        print("\n❌ REGRESSION so với baseline:")
+        for line in problems:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\n✅ Không có regression so với baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Nhập điểm từ công cụ chấm điểm: POST enrollments.assign từng điểm (mỗi lần một commit)
+so với POST /api/v1/enrollments:batch một lô (một transaction, email vào hàng đợi).
+
+Chạy:  python -m benchmarks.bench_enrollment_batch --records 5000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_enrollment_batch.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Course, Student, User, Role  # noqa: E402
+from app.seed_bulk import generate, _insert  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=300)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--single", type=int, default=300, help="Số lần gọi enrollments.assign để đo (nội suy).")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config.update(WTF_CSRF_ENABLED=False, MAIL_SUPPRESS_SEND=True)
+    with app.app_context():
+        db.create_all()
+        data = generate(random.Random(42), args.students, args.courses, args.students * 5, 2025)
+        for model, rows in data.items():
+            _insert(model, rows)
+        admin = User(email="bench@demo.com", role=Role.ADMIN)
+        admin.set_password("123456")
+        db.session.add(admin)
+        db.session.commit()
+        students = db.session.execute(db.select(Student.id, Student.code)).all()
+        courses = db.session.execute(db.select(Course.id, Course.code)).all()
+
+    rng = random.Random(7)
+    client = app.test_client()
+    client.post("/login", data={"email": "bench@demo.com", "password": "123456"})
+
+    t0 = time.perf_counter()
+    for _ in range(args.single):
+        s, c = rng.choice(students), rng.choice(courses)
+        client.post("/enrollments/assign", data={"student_id": s.id, "course_id": c.id,
+                                                 "semester": "2026A", "grade": round(rng.uniform(0, 10), 1)})
+    single = (time.perf_counter() - t0) / args.single * 1000
+
+    records = [{"student_code": rng.choice(students).code, "course_code": rng.choice(courses).code,
+                "semester": "2026B", "grade": round(rng.uniform(0, 10), 1)} for _ in range(args.records)]
+    ndjson = "\n".join(json.dumps(r) for r in records)
+    t0 = time.perf_counter()
+    resp = client.post("/api/v1/enrollments:batch", data=ndjson, content_type="application/x-ndjson")
+    elapsed = time.perf_counter() - t0
+    body = resp.get_json()
+
+    print(f"{args.records:,} bản ghi (HTTP {resp.status_code}: {body['inserted']} thêm, "
+          f"{body['updated']} cập nhật, {body['skipped']} bỏ qua)")
+    print(f"  enrollments.assign từng điểm  {single * 1000:>9.0f} ms / 1k  (nội suy từ {args.single} lần)")
+    print(f"  enrollments:batch             {elapsed * 1000 / args.records * 1000:>9.0f} ms / 1k  "
+          f"(server ghi {body['timing']['ms_per_1k']} ms / 1k)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Thời gian xếp lịch thi cả học kỳ ở quy mô thật: dựng đồ thị xung đột (numpy) + tô màu
+tham lam + xếp phòng, và cả đường đi đầy đủ qua database (plan_exams).
+SV chọn học phần chủ yếu trong nhóm ngành/khóa của mình để đồ thị giống dữ liệu thật.
+
+Chạy:  python -m benchmarks.bench_exam_scheduler --students 100000 --courses 3000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_exams.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Student, Course, Enrollment  # noqa: E402
+from app.seed_bulk import _insert  # noqa: E402
+from app.utils.exam_scheduler import conflict_graph, color_courses, plan_exams  # noqa: E402
+
+GROUPS = 60  # nhóm ngành x khóa
+
+
+def enrollments(rnd, n_students, n_courses, per_student):
+    """(SV, HP): 80% học phần trong nhóm của SV, 20% môn chung / tự chọn bất kỳ"""
+    group_size = max(per_student, n_courses // GROUPS)
+    pairs = []
+    for s in range(1, n_students + 1):
+        base = (s % GROUPS) * group_size % n_courses
+        own = [1 + (base + k) % n_courses for k in range(group_size)]
+        picked = set(rnd.sample(own, min(len(own), per_student)))
+        for k in range(per_student):
+            if rnd.random() < 0.2:
+                picked.add(rnd.randint(1, n_courses))
+        for c in list(picked)[:per_student]:
+            pairs.append((s, c))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--courses", type=int, default=3000)
+    parser.add_argument("--per-student", type=int, default=7, help="Số HP mỗi SV trong học kỳ.")
+    parser.add_argument("--rooms", type=int, default=300)
+    parser.add_argument("--sessions", type=int, default=4, help="Số ca thi mỗi ngày.")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    pairs = enrollments(rnd, args.students, args.courses, args.per_student)
+    rooms = [(f"P{i:03d}", rnd.choice([40, 40, 60, 60, 80, 120, 200])) for i in range(args.rooms)]
+    print(f"{args.students:,} SV, {args.courses:,} HP, {len(pairs):,} ghi danh, "
+          f"{args.rooms} phòng ({sum(c for _, c in rooms):,} chỗ/ca)")
+
+    student_ids, course_ids = zip(*pairs)
+    t0 = time.perf_counter()
+    courses, sizes, indptr, indices = conflict_graph(student_ids, course_ids)
+    t1 = time.perf_counter()
+    slot_of, _ = color_courses(sizes, indptr, indices, rooms)
+    t2 = time.perf_counter()
+    print(f"  đồ thị xung đột   {t1 - t0:>6.2f}s  ({len(indices) // 2:,} cạnh)")
+    print(f"  tô màu + xếp phòng {t2 - t1:>5.2f}s  ({int(slot_of.max()) + 1} ca)")
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        _insert(Student, [{"id": s, "code": f"SV{s:07d}", "full_name": "SV", "email": f"sv{s}@e.vn",
+                           "class_name": "X", "created_at": None}
+                          for s in range(1, args.students + 1)])
+        _insert(Course, [{"id": c, "code": f"HP{c:05d}", "name": "HP", "credits": 3, "created_at": None}
+                         for c in range(1, args.courses + 1)])
+        _insert(Enrollment, [{"id": i + 1, "student_id": s, "course_id": c, "semester": "2025B",
+                              "grade": None, "created_at": None} for i, (s, c) in enumerate(pairs)])
+        db.session.commit()
+
+        t0 = time.perf_counter()
+        plan = plan_exams("2025B", date(2025, 12, 8), rooms, [450, 585, 780, 915][:args.sessions])
+        print(f"  plan_exams (cả đọc DB) {time.perf_counter() - t0:.2f}s -> "
+              f"{len(plan.slots)} ca / {plan.days} ngày")
+
+
+if __name__ == "__main__":
+    main()
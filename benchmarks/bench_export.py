@@ -0,0 +1,87 @@
+"""
+Đo bộ nhớ đỉnh (tracemalloc) của export điểm ở nhiều kích thước dữ liệu.
+
+Chạy:  python -m benchmarks.bench_export --sizes 10000 50000 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_export.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Student, Course, Enrollment  # noqa: E402
+from app.utils.grade_export import iter_grade_rows, write_grades_xlsx, iter_grades_csv  # noqa: E402
+
+N_COURSES = 200
+
+
+def fill(n_enrollments, start):
+    """Thêm enrollment cho tới khi đủ n_enrollments (mỗi sinh viên 20 học phần)"""
+    per_student = 20
+    students = [{"code": f"SV{i:07d}", "full_name": f"Nguyễn Văn {i}",
+                 "email": f"sv{i}@example.com", "class_name": "DTS1"}
+                for i in range(start // per_student, n_enrollments // per_student)]
+    if students:
+        db.session.execute(db.insert(Student), students)
+    ids = [r.id for r in db.session.query(Student.id).filter(
+        Student.code.in_([s["code"] for s in students])).all()] if students else []
+    rows = [{"student_id": sid, "course_id": 1 + (sid + k) % N_COURSES,
+             "semester": "2025A", "grade": (sid * 7 + k) % 101 / 10}
+            for sid in ids for k in range(per_student)]
+    for i in range(0, len(rows), 10000):
+        db.session.execute(db.insert(Enrollment), rows[i:i + 10000])
+    db.session.commit()
+
+
+def measure(fn):
+    """Thời gian đo ở lượt chạy riêng vì tracemalloc làm chậm đáng kể"""
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Course), [
+            {"code": f"HP{i:04d}", "name": f"Học phần {i}", "credits": 3}
+            for i in range(N_COURSES)])
+        db.session.commit()
+
+        current = 0
+        print(f"{'rows':>8} {'xlsx s':>8} {'xlsx MB':>8} {'csv s':>8} {'csv MB':>8}")
+        for size in sorted(args.sizes):
+            fill(size, current)
+            current = size
+            db.session.expunge_all()
+
+            def xlsx():
+                with tempfile.TemporaryFile() as tmp:
+                    write_grades_xlsx(iter_grade_rows(all_students=True), tmp)
+
+            def csv():
+                for _ in iter_grades_csv(iter_grade_rows(all_students=True)):
+                    pass
+
+            xs, xm = measure(xlsx)
+            cs, cm = measure(csv)
+            print(f"{size:>8} {xs:>8.2f} {xm:>8.1f} {cs:>8.2f} {cm:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
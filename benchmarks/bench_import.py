@@ -0,0 +1,109 @@
+"""
+So sánh import điểm: vòng lặp từng dòng (cách cũ) vs import_grades theo lô.
+
+Chạy:  python -m benchmarks.bench_import --rows 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_import.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Student, Course, Enrollment  # noqa: E402
+from app.utils.grade_import import import_grades  # noqa: E402
+
+
+def make_dataset(n_rows, n_students, n_courses, seed=42):
+    rnd = random.Random(seed)
+    students = [Student(code=f"SV{i:06d}", full_name=f"Sinh viên {i}",
+                        email=f"sv{i}@example.com", class_name="DTS1")
+                for i in range(n_students)]
+    courses = [Course(code=f"HP{i:04d}", name=f"Học phần {i}", credits=3)
+               for i in range(n_courses)]
+    db.session.add_all(students + courses)
+    db.session.commit()
+
+    rows, seen = [], set()
+    while len(rows) < n_rows:
+        key = (rnd.randrange(n_students), rnd.randrange(n_courses))
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append({
+            "student_code": f"SV{key[0]:06d}",
+            "course_code": f"HP{key[1]:04d}",
+            "semester": "2025A",
+            "grade": round(rnd.uniform(0, 10), 1),
+        })
+    return rows
+
+
+def legacy_import(rows):
+    """Vòng lặp cũ của enrollments.upload (không gửi email)."""
+    inserts = 0
+    for row in rows:
+        s = Student.query.filter_by(code=str(row["student_code"]).strip()).first()
+        c = Course.query.filter_by(code=str(row["course_code"]).strip()).first()
+        if not s or not c:
+            continue
+        e = Enrollment(student_id=s.id, course_id=c.id,
+                       semester=str(row["semester"]).strip(), grade=row["grade"])
+        db.session.add(e)
+        try:
+            db.session.commit()
+            inserts += 1
+        except Exception:
+            db.session.rollback()
+    return inserts
+
+
+def reset_enrollments():
+    db.session.query(Enrollment).delete()
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        rows = make_dataset(args.rows, args.students, args.courses)
+
+        if not args.skip_legacy:
+            t0 = time.perf_counter()
+            n = legacy_import(rows)
+            legacy = time.perf_counter() - t0
+            print(f"legacy  : {n:>7} rows in {legacy:8.2f}s ({n / legacy:,.0f} rows/s)")
+            reset_enrollments()
+
+        t0 = time.perf_counter()
+        report = import_grades(rows)
+        bulk = time.perf_counter() - t0
+        print(f"bulk    : {report.inserted:>7} rows in {bulk:8.2f}s "
+              f"({report.inserted / bulk:,.0f} rows/s)")
+
+        # Import lại cùng file: toàn bộ là cập nhật / không đổi
+        for r in rows[::2]:
+            r["grade"] = 10.0 - r["grade"] if r["grade"] != 5.0 else 4.0
+        t0 = time.perf_counter()
+        report = import_grades(rows)
+        again = time.perf_counter() - t0
+        print(f"re-run  : {report.updated:>7} updated, {report.skipped} skipped in {again:8.2f}s")
+
+        if not args.skip_legacy:
+            print(f"speed-up: {legacy / bulk:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Đo throughput của hàng đợi email với một SMTP server giả lập chạy local.
+
+Chạy:  python -m benchmarks.bench_mail_queue --messages 2000 --students 500
+"""
+import argparse
+import os
+import random
+import socketserver
+import tempfile
+import threading
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_mail.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db, mail  # noqa: E402
+from app.models import MailQueue  # noqa: E402
+from app.utils.mail_queue import queue_grade_notifications, process_queue  # noqa: E402
+
+
+# ==========================
+# 📮 SMTP server giả lập
+# ==========================
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 localhost SMTP stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="replace").strip().upper()
+            if cmd.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif cmd == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self.reply("250 OK")
+            elif cmd == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000, help="Số điểm cần thông báo")
+    parser.add_argument("--students", type=int, default=500, help="Số người nhận khác nhau")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    server = SMTPStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    app = create_app()
+    app.config.update(
+        MAIL_SERVER="127.0.0.1", MAIL_PORT=server.server_address[1],
+        MAIL_USE_TLS=False, MAIL_USERNAME=None, MAIL_PASSWORD=None,
+        MAIL_DEFAULT_SENDER="bench@example.com", MAIL_DEBUG=False,
+    )
+    mail.init_app(app)
+    with app.app_context():
+        db.create_all()
+        rnd = random.Random(42)
+        queue_grade_notifications([
+            (f"sv{rnd.randrange(args.students)}@example.com", f"Học phần {i}",
+             round(rnd.uniform(0, 10), 1))
+            for i in range(args.messages)
+        ])
+        db.session.commit()
+
+        t0 = time.perf_counter()
+        emails = 0
+        while True:
+            sent, failed = process_queue(args.batch_size)
+            if not sent and not failed:
+                break
+            emails += sent
+        elapsed = time.perf_counter() - t0
+
+        done = MailQueue.query.filter_by(status=MailQueue.SENT).count()
+        print(f"queued grades : {args.messages}")
+        print(f"delivered     : {done} grades in {emails} digest emails")
+        print(f"smtp sessions : {server.connections}")
+        print(f"elapsed       : {elapsed:.2f}s ({done / elapsed:,.0f} grades/s, "
+              f"{emails / elapsed:,.0f} emails/s)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
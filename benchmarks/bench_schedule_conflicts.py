@@ -0,0 +1,75 @@
+"""
+Chi phí một lần kiểm tra trùng phòng (find_room_conflicts) khi tạo / sửa TKB, với hàng
+chục nghìn buổi học: có chỉ mục (room, weekday, start_minute) so với khi bỏ chỉ mục đó.
+
+Chạy:  python -m benchmarks.bench_schedule_conflicts --slots 50000 --checks 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_schedule.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Course, Schedule  # noqa: E402
+from app.seed_bulk import TIME_SLOTS, WEEKDAYS, BUILDINGS, _insert  # noqa: E402
+from app.utils.timeslots import find_room_conflicts  # noqa: E402
+
+
+def measure(probes):
+    latencies, hits = [], 0
+    for room, weekday, start, end in probes:
+        t0 = time.perf_counter()
+        hits += bool(find_room_conflicts(room, weekday, start, end))
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        db.session.expunge_all()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99)], hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slots", type=int, default=50000, help="Số buổi học trong TKB.")
+    parser.add_argument("--checks", type=int, default=2000, help="Số lần kiểm tra mỗi chế độ.")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    rooms = [f"{b}{floor}{n:02d}" for b in BUILDINGS for floor in range(1, 6) for n in range(1, 41)]
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Course(id=1, code="BENCH", name="Bench", credits=3))
+        db.session.flush()
+        rows = []
+        for i in range(args.slots):
+            start, end = rnd.choice(TIME_SLOTS)
+            rows.append({"id": i + 1, "course_id": 1, "weekday": rnd.choice(WEEKDAYS),
+                         "start_minute": start, "end_minute": end, "room": rnd.choice(rooms)})
+        _insert(Schedule, rows)
+        db.session.execute(db.text("ANALYZE"))
+        db.session.commit()
+
+        probes = []
+        for _ in range(args.checks):
+            start = rnd.randrange(7 * 60, 20 * 60, 15)
+            probes.append((rnd.choice(rooms), rnd.choice(WEEKDAYS), start, start + 120))
+
+        print(f"{args.slots:,} buổi học, {len(rooms)} phòng, {args.checks} lần kiểm tra")
+        print(f"{'chế độ':<22} {'p50 us':>8} {'p99 us':>8} {'trùng':>6}")
+        measure(probes[:100])  # làm nóng
+        p50, p99, hits = measure(probes)
+        print(f"{'ix_schedule_room_slot':<22} {p50:>8.0f} {p99:>8.0f} {hits:>6}")
+
+        db.session.execute(db.text("DROP INDEX ix_schedule_room_slot"))
+        db.session.commit()
+        p50, p99, hits = measure(probes)
+        print(f"{'không chỉ mục':<22} {p50:>8.0f} {p99:>8.0f} {hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+So sánh tìm kiếm sinh viên: ILIKE 3 cột (cách cũ) vs chỉ mục FTS5 không dấu.
+
+Chạy:  python -m benchmarks.bench_search --students 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Student  # noqa: E402
+from app.utils.search import rebuild_search_index, student_search_filter  # noqa: E402
+
+HO = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+DEM = ["Văn", "Thị", "Hữu", "Đức", "Minh", "Ngọc", "Thanh", "Quốc", "Gia", "Bảo"]
+TEN = ["An", "Bình", "Châu", "Dũng", "Đạt", "Giang", "Hà", "Hải", "Hương", "Khánh",
+       "Linh", "Long", "Mai", "Nam", "Nhung", "Phúc", "Quân", "Sơn", "Thảo", "Trang", "Tú", "Vy"]
+
+QUERIES = ["nguyen", "Nguyễn Văn", "dat", "tran thi mai", "SV000012", "huong", "sv9999"]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        rnd = random.Random(42)
+        rows = [{"code": f"SV{i:07d}",
+                 "full_name": f"{rnd.choice(HO)} {rnd.choice(DEM)} {rnd.choice(TEN)}",
+                 "email": f"sv{i}@st.example.edu.vn", "class_name": f"DTS{i % 40}"}
+                for i in range(args.students)]
+        for i in range(0, len(rows), 10000):
+            db.session.execute(db.insert(Student), rows[i:i + 10000])
+        db.session.commit()
+
+        t0 = time.perf_counter()
+        rebuild_search_index()
+        print(f"index build: {time.perf_counter() - t0:.2f}s for {args.students} students\n")
+
+        print(f"{'query':<16} {'ilike ms':>9} {'fts ms':>9} {'hits':>7}")
+        for q in QUERIES:
+            like = f"%{q}%"
+            legacy = Student.query.filter(
+                Student.full_name.ilike(like) | Student.code.ilike(like) | Student.email.ilike(like))
+            fts = Student.query.filter(student_search_filter(q))
+
+            ilike_ms = timed(lambda: legacy.order_by(Student.id.desc()).limit(50).all(), args.repeat)
+            fts_ms = timed(lambda: fts.order_by(Student.id.desc()).limit(50).all(), args.repeat)
+            hits = fts.count()
+            print(f"{q:<16} {ilike_ms:>9.2f} {fts_ms:>9.2f} {hits:>7}")
+
+
+if __name__ == "__main__":
+    main()
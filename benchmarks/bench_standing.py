@@ -0,0 +1,62 @@
+"""
+Job xếp loại học kỳ sau một đợt nhập điểm: lần đầu tính cho toàn bộ SV, các lần sau
+chỉ tính SV có điểm thay đổi (nhập điểm một học phần ~ vài trăm SV).
+
+Chạy:  python -m benchmarks.bench_standing --students 100000 --changed 500
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_standing.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import AcademicStanding, Course, Enrollment, Student  # noqa: E402
+from app.seed_bulk import generate, _insert  # noqa: E402
+from app.utils.grade_import import import_grades  # noqa: E402
+from app.utils.standing import compute_standing  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--courses", type=int, default=1500)
+    parser.add_argument("--changed", type=int, default=500, help="Số điểm sửa trước lần chạy tăng dần.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        data = generate(random.Random(42), args.students, args.courses, args.students * 20, 2025)
+        for model, rows in data.items():
+            _insert(model, rows)
+        db.session.commit()
+
+        full = compute_standing(full=True)
+        print(f"{args.students:,} SV, {len(data[Enrollment]):,} ghi danh")
+        print(f"  toàn bộ       {full.seconds:>7.2f}s  ({full.rows:,} dòng SV x học kỳ)")
+
+        picked = db.session.execute(
+            db.select(Student.code, Course.code, Enrollment.semester)
+            .join(Student, Enrollment.student_id == Student.id)
+            .join(Course, Enrollment.course_id == Course.id)
+            .where(Enrollment.grade.isnot(None))
+            .order_by(db.func.random()).limit(args.changed)
+        ).all()
+        import_grades([{"student_code": s, "course_code": c, "semester": sem, "grade": 10.0}
+                       for s, c, sem in picked])
+        t0 = time.perf_counter()
+        run = compute_standing()
+        elapsed = time.perf_counter() - t0
+        print(f"  tăng dần      {elapsed:>7.2f}s  ({run.students:,} SV, {run.rows:,} dòng)")
+        counts = dict(db.session.query(AcademicStanding.standing, db.func.count())
+                      .group_by(AcademicStanding.standing).all())
+        print(f"  xếp loại: {counts}")
+
+
+if __name__ == "__main__":
+    main()
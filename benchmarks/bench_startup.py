@@ -0,0 +1,69 @@
+"""
+Đo thời gian khởi động và bộ nhớ (RSS) của create_app() trong tiến trình mới,
+giống như mỗi worker gunicorn / mỗi lệnh `flask ...`.
+
+Chạy:  python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+heavy = [m for m in ("pandas", "numpy", "openpyxl", "reportlab") if m in sys.modules]
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": heavy,
+}))
+"""
+
+# Chi phí nạp lần đầu của từng thư viện (trả khi endpoint tương ứng được gọi lần đầu)
+LAZY = {
+    "pandas (upload)": "import pandas",
+    "openpyxl (export)": "import openpyxl",
+    "reportlab (transcript)": "import reportlab.pdfgen.canvas",
+}
+
+
+def run(code):
+    # SQLite tạm: không cần driver MySQL để đo khởi động
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI="sqlite://")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True, env=env).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run(PROBE) for _ in range(args.repeat)]
+    for key in ("import_ms", "create_app_ms", "rss_mb"):
+        print(f"{key:<15} median {statistics.median(s[key] for s in samples):8.1f}")
+    print(f"{'heavy loaded':<15} {samples[-1]['heavy'] or 'none'}")
+
+    print("\nfirst-use cost:")
+    for label, stmt in LAZY.items():
+        probe = ("import json, resource, time; t = time.perf_counter(); " + stmt + "; "
+                 "print(json.dumps({'ms': (time.perf_counter() - t) * 1000, "
+                 "'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))")
+        r = [run(probe) for _ in range(args.repeat)]
+        print(f"  {label:<24} {statistics.median(x['ms'] for x in r):8.1f} ms "
+              f"{statistics.median(x['rss_mb'] for x in r):8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
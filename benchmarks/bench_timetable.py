@@ -0,0 +1,58 @@
+"""
+Đầu học kỳ: hàng nghìn sinh viên mở TKB cá nhân, mỗi người vài lần.
+So sánh dựng TKB (join Enrollment -> Schedule -> Course) ở mọi lần gọi
+(TIMETABLE_CACHE_TTL=0) với cache theo worker.
+
+Chạy:  python -m benchmarks.bench_timetable --students 5000 --views 3
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_timetable.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.seed_bulk import generate, _insert  # noqa: E402
+from app.utils.timetable import student_timetable, timetable_cache  # noqa: E402
+from app.utils.query_count import count_queries  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--views", type=int, default=3, help="Số lần mỗi SV mở TKB.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        data = generate(random.Random(42), args.students, args.courses, args.students * 20, 2025)
+        for model, rows in data.items():
+            _insert(model, rows)
+        db.session.commit()
+        engine = db.engine
+
+    visits = [sid for sid in range(1, args.students + 1) for _ in range(args.views)]
+    random.Random(1).shuffle(visits)
+
+    print(f"{args.students:,} SV x {args.views} lần xem")
+    print(f"{'TIMETABLE_CACHE_TTL':<20} {'queries':>9} {'tổng s':>8} {'us/lần':>8}")
+    for ttl in (0, 300):
+        app.config["TIMETABLE_CACHE_TTL"] = ttl
+        timetable_cache.invalidate()
+        with app.app_context(), count_queries(engine) as counter:
+            t0 = time.perf_counter()
+            for sid in visits:
+                student_timetable(sid)
+            elapsed = time.perf_counter() - t0
+        print(f"{ttl:<20} {counter.count:>9,} {elapsed:>8.2f} {elapsed / len(visits) * 1e6:>8.0f}")
+    print(f"\ntimetable cache: {timetable_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Chi phí cố định mỗi request của người dùng đã đăng nhập: user_loader truy vấn bảng user
+(USER_CACHE_TTL=0) so với cache danh tính theo worker (USER_CACHE_TTL>0).
+
+Chạy:  python -m benchmarks.bench_user_cache --requests 600
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import timeit
+
+_db_path = os.path.join(tempfile.mkdtemp(), "bench_user_cache.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Role, user_cache, load_user  # noqa: E402
+from app.seed_bulk import generate, _insert  # noqa: E402
+from app.utils.gpa import rebuild_all_gpa  # noqa: E402
+from app.utils.query_count import count_queries  # noqa: E402
+
+PAGES = ["/", "/students/", "/courses/", "/enrollments/", "/schedule", "/exams"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=600, help="Số request mỗi chế độ.")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+        for model, rows in generate(random.Random(42), 2000, 60, 20000, 2025).items():
+            _insert(model, rows)
+        users = [User(email="admin@demo.com", role=Role.ADMIN),
+                 User(email="student@demo.com", role=Role.STUDENT, student_id=1)]
+        for u in users:
+            u.set_password("123456")
+        db.session.add_all(users)
+        db.session.commit()
+        rebuild_all_gpa()
+        engine = db.engine
+
+    clients = []
+    for email in ("admin@demo.com", "student@demo.com"):
+        client = app.test_client()
+        client.post("/login", data={"email": email, "password": "123456"})
+        clients.append(client)
+
+    for client in clients:  # làm nóng
+        for url in PAGES:
+            client.get(url)
+
+    # Hai chế độ chạy xen kẽ theo từng vòng để nhiễu của máy chia đều cho cả hai
+    modes = {0: {"queries": 0, "latencies": []}, 30: {"queries": 0, "latencies": []}}
+    rounds = 10
+    for r in range(rounds):
+        for ttl, acc in modes.items():
+            app.config["USER_CACHE_TTL"] = ttl
+            with count_queries(engine) as counter:
+                for i in range(args.requests // rounds):
+                    client, url = clients[i % 2], PAGES[(i // 2) % len(PAGES)]
+                    t0 = time.perf_counter()
+                    assert client.get(url).status_code == 200, url
+                    acc["latencies"].append((time.perf_counter() - t0) * 1000)
+            acc["queries"] += counter.count
+
+    print(f"{'USER_CACHE_TTL':<15} {'queries/req':>12} {'mean ms':>9} {'p50 ms':>8} {'user_loader us':>15}")
+    for ttl, acc in modes.items():
+        app.config["USER_CACHE_TTL"] = ttl
+        with app.test_request_context():
+            def loader():
+                db.session.expunge_all()  # như request mới: identity map rỗng
+                return load_user("1")
+            loader_us = timeit.timeit(loader, number=2000) / 2000 * 1e6
+        n = len(acc["latencies"])
+        print(f"{ttl:<15} {acc['queries'] / n:>12.2f} {statistics.mean(acc['latencies']):>9.2f} "
+              f"{statistics.median(acc['latencies']):>8.2f} {loader_us:>15.0f}")
+    print(f"\nuser cache: {user_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
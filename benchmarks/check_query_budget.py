@@ -0,0 +1,92 @@
+"""
+Kiểm tra ngân sách số câu SQL cho các trang đọc bảng điểm (chống N+1).
+Số truy vấn không được tăng theo số dòng: chạy ở hai kích thước dữ liệu và
+thoát với mã 1 nếu endpoint nào vượt ngân sách hoặc tốn thêm câu SQL khi dữ liệu lớn hơn.
+
+Chạy:  python -m benchmarks.check_query_budget
+"""
+import os
+import sys
+import tempfile
+
+_db_path = os.path.join(tempfile.mkdtemp(), "query_budget.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Student, Course, Enrollment, Role  # noqa: E402
+from app.utils.query_count import query_budget, QueryBudgetExceeded  # noqa: E402
+
+# Endpoint -> số câu SQL tối đa (gồm cả truy vấn nạp user của Flask-Login)
+BUDGETS = {
+    "/enrollments/": 4,
+    "/enrollments/?limit=200": 4,
+    "/enrollments/export": 3,
+    "/enrollments/export?format=csv": 3,
+    "/enrollments/transcript/{student_id}.pdf": 5,
+}
+
+# Số SV ở mỗi lần chạy (mỗi SV học mọi học phần)
+SIZES = (50, 500)
+
+
+def seed(n_students, n_courses=30):
+    db.session.execute(db.insert(Course), [
+        {"code": f"HP{i:03d}", "name": f"Học phần {i}", "credits": 3} for i in range(n_courses)])
+    db.session.execute(db.insert(Student), [
+        {"code": f"SV{i:05d}", "full_name": f"Sinh viên {i}", "email": f"sv{i}@example.com"}
+        for i in range(n_students)])
+    db.session.execute(db.insert(Enrollment), [
+        {"student_id": s, "course_id": c, "semester": "2025A", "grade": (s + c) % 11}
+        for s in range(1, n_students + 1) for c in range(1, n_courses + 1)])
+    admin = User(email="admin@demo.com", role=Role.ADMIN)
+    admin.set_password("123456")
+    db.session.add(admin)
+    db.session.commit()
+
+
+def check(app, n_students):
+    """Trả về {url: số câu SQL} (None nếu vượt ngân sách)"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed(n_students)
+        engine = db.engine
+
+    # Mỗi request có app context (và session) riêng như khi chạy thật
+    client = app.test_client()
+    client.post("/login", data={"email": "admin@demo.com", "password": "123456"})
+    counts = {}
+    for url, budget in BUDGETS.items():
+        url = url.format(student_id=1)
+        try:
+            with query_budget(budget, engine=engine, label=url) as counter:
+                resp = client.get(url)
+            status, counts[url] = "ok", counter.count
+        except QueryBudgetExceeded as ex:
+            status, counts[url] = f"FAIL\n{ex}", None
+            resp = None
+        code = resp.status_code if resp is not None else "-"
+        print(f"{url:<45} {code} {counter.count:>3} / {budget:<3} {status}")
+    return counts
+
+
+def main():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    runs = []
+    for n in SIZES:
+        print(f"--- {n} SV")
+        runs.append(check(app, n))
+
+    small, large = runs[0], runs[-1]
+    failures = sum(1 for counts in runs for c in counts.values() if c is None)
+    for url, count in large.items():
+        if None not in (count, small[url]) and count > small[url]:
+            print(f"FAIL {url}: {small[url]} câu SQL với {SIZES[0]} SV -> {count} với {SIZES[-1]} SV")
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
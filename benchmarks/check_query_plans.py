@@ -0,0 +1,144 @@
+"""
+Kiểm tra kế hoạch thực thi (EXPLAIN QUERY PLAN) của các câu SQL mà trang dashboard,
+lịch thi / TKB và các trang điểm thực sự gửi xuống database.
+Database được dựng bằng `flask db upgrade` (kiểm tra luôn migration chỉ mục), nạp dữ liệu
+rồi ANALYZE. Câu nào quét cả bảng (SCAN không dùng chỉ mục) mà không nằm trong
+ALLOWED_SCANS thì in kế hoạch và thoát với mã 1.
+
+Chạy:  python -m benchmarks.check_query_plans [-v] [--revision head]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_db_path = os.path.join(tempfile.mkdtemp(), "query_plans.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_db_path}"
+
+from flask_migrate import upgrade  # noqa: E402
+from sqlalchemy import event, inspect  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Student, Course, Enrollment, Exam, Schedule, Role  # noqa: E402
+from app.main.routes import dashboard_cache  # noqa: E402
+from app.utils.gpa import rebuild_all_gpa  # noqa: E402
+
+# (URL, tài khoản đăng nhập)
+PAGES = [
+    ("/", "admin@demo.com"),
+    ("/", "sv1@st.example.edu.vn"),
+    ("/exams", "admin@demo.com"),
+    ("/schedule", "admin@demo.com"),
+    ("/schedule", "sv1@st.example.edu.vn"),
+    ("/enrollments/", "admin@demo.com"),
+    ("/enrollments/?after=5000", "admin@demo.com"),
+    ("/enrollments/export?format=csv", "sv1@st.example.edu.vn"),
+    ("/enrollments/transcript/1.pdf", "sv1@st.example.edu.vn"),
+    ("/api/v1/enrollments?after=5000&fields=grade", "admin@demo.com"),
+    ("/api/v1/enrollments?course_id=3", "admin@demo.com"),
+    ("/api/v1/enrollments", "sv1@st.example.edu.vn"),
+]
+
+# Quét toàn bảng là bản chất của câu truy vấn (đếm / gom nhóm trên mọi dòng)
+ALLOWED_SCANS = {
+    # Top học phần: duyệt mọi học phần, mỗi học phần tra enrollment qua ix_enrollment_course_id
+    "course": "dashboard: top courses GROUP BY course.id",
+}
+
+def seed(n_students=5000, n_courses=60):
+    db.session.execute(db.insert(Course), [
+        {"code": f"HP{i:03d}", "name": f"Học phần {i}", "credits": 3} for i in range(n_courses)])
+    db.session.execute(db.insert(Student), [
+        {"code": f"SV{i:05d}", "full_name": f"Sinh viên {i}",
+         "email": f"sv{i}@st.example.edu.vn", "class_name": f"DTS{i % 40}"}
+        for i in range(1, n_students + 1)])
+    db.session.execute(db.insert(Enrollment), [
+        {"student_id": s, "course_id": c, "semester": "2025A", "grade": (s * 7 + c) % 101 / 10}
+        for s in range(1, n_students + 1) for c in range(1 + s % 6, n_courses + 1, 6)])
+    today = datetime.date(2026, 1, 5)
+    db.session.execute(db.insert(Exam), [
+        {"course_id": c, "date": today + datetime.timedelta(days=c % 30), "room": f"P{c}"}
+        for c in range(1, n_courses + 1)])
+    db.session.execute(db.insert(Schedule), [
+        {"course_id": c, "weekday": c % 6 + 1, "start_minute": 450, "end_minute": 570, "room": f"P{c}"}
+        for c in range(1, n_courses + 1)])
+    admin = User(email="admin@demo.com", role=Role.ADMIN)
+    admin.set_password("123456")
+    student = User(email="sv1@st.example.edu.vn", role=Role.STUDENT, student_id=1)
+    student.set_password("123456")
+    db.session.add_all([admin, student])
+    db.session.commit()
+    rebuild_all_gpa()
+    db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
+
+
+def full_scans(statement, plan, tables):
+    """Các bảng thật bị SCAN mà không qua chỉ mục nào"""
+    # ORDER BY khóa chính + LIMIT (phân trang keyset): duyệt theo rowid và dừng sớm
+    if " LIMIT " in f" {statement.upper()} " and not any("TEMP B-TREE" in d for d in plan):
+        return []
+    found = []
+    for detail in plan:
+        if detail.startswith("SCAN ") and " INDEX " not in f"{detail} ":
+            name = detail.split()[1]
+            if name in tables:
+                found.append(name)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-v", "--verbose", action="store_true", help="In kế hoạch của mọi câu SQL.")
+    parser.add_argument("--revision", default="head", help="Nâng cấp schema tới revision này.")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        upgrade(directory=os.path.join(ROOT, "migrations"), revision=args.revision)
+        seed()
+        engine = db.engine
+        tables = set(inspect(engine).get_table_names())
+
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failures = 0
+    for url, email in PAGES:
+        client = app.test_client()
+        client.post("/login", data={"email": email, "password": "123456"})
+        dashboard_cache.invalidate()
+        captured.clear()
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            resp = client.get(url)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        bad = []
+        with engine.connect() as conn:
+            for statement, params in captured:
+                plan = [r[-1] for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)]
+                scans = [t for t in full_scans(statement, plan, tables) if t not in ALLOWED_SCANS]
+                if scans or args.verbose:
+                    print(f"\n  {' '.join(statement.split())[:300]}")
+                    for detail in plan:
+                        print(f"    {detail}")
+                if scans:
+                    bad.append(scans)
+
+        status = "ok" if not bad else "FAIL (" + ", ".join(sorted({t for s in bad for t in s})) + ")"
+        failures += bool(bad)
+        print(f"{url:<46} {email:<24} {resp.status_code} {len(captured):>3} queries  {status}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
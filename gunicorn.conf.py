@@ -0,0 +1,12 @@
+# gunicorn.conf.py — gunicorn -c gunicorn.conf.py run:app
+import os
+from prometheus_client import multiprocess
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+
+
+def child_exit(server, worker):
+    # Dọn file metric của worker đã thoát (PROMETHEUS_MULTIPROC_DIR)
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -9,7 +9,8 @@ with app.app_context():
         print("⚠️ Không tìm thấy môn học nào trong database. Hãy tạo ít nhất 1 Course trước.")
     else:
         e = Exam(course_id=c.id, date=date(2025, 12, 20), room="A101", note="Giữa kỳ")
-        s = Schedule(course_id=c.id, weekday="Thứ Hai", time="07:30 - 09:30", room="A204")
+        s = Schedule(course_id=c.id, weekday=1, start_minute=450, end_minute=570,
+                     room="A204")  # Thứ Hai, 07:30 - 09:30
 
         db.session.add_all([e, s])
         db.session.commit()
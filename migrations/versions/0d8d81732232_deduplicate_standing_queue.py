@@ -0,0 +1,31 @@
+"""deduplicate standing queue
+
+Revision ID: 0d8d81732232
+Revises: c4d296286876
+Create Date: 2026-10-18 20:52:30.461775
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d8d81732232'
+down_revision = 'c4d296286876'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Giữ một dòng mỗi SV (bảng con dẫn xuất: MySQL không cho DELETE đọc thẳng chính bảng đó)
+    op.execute(
+        "DELETE FROM standing_queue WHERE id NOT IN "
+        "(SELECT id FROM (SELECT MAX(id) AS id FROM standing_queue GROUP BY student_id) AS keep)"
+    )
+    with op.batch_alter_table('standing_queue', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_standing_queue_student_id'), ['student_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('standing_queue', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_standing_queue_student_id'))
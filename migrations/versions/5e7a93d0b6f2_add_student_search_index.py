@@ -0,0 +1,40 @@
+"""add student full-text search index
+
+Revision ID: 5e7a93d0b6f2
+Revises: c41f0e6a2d93
+Create Date: 2026-10-18 11:20:31.604918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7a93d0b6f2'
+down_revision = 'c41f0e6a2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite: bảng ảo FTS5; backend khác: bảng student_search + chỉ mục trigram
+    from app.utils.search import ensure_search_index, _document
+    bind = op.get_bind()
+    ensure_search_index(bind)
+
+    table = "student_fts" if bind.dialect.name == "sqlite" else "student_search"
+    key = "rowid" if bind.dialect.name == "sqlite" else "student_id"
+    rows = bind.execute(sa.text("SELECT id, full_name, code, email FROM student")).all()
+    if rows:
+        bind.execute(
+            sa.text(f"INSERT INTO {table} ({key}, document) VALUES (:id, :doc)"),
+            [{"id": r.id, "doc": _document(r.full_name, r.code, r.email)} for r in rows],
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS student_fts")
+    else:
+        op.execute("DROP TABLE IF EXISTS student_search")
@@ -0,0 +1,48 @@
+"""add academic standing and its change queue
+
+Revision ID: 74bbc865dc14
+Revises: e1f4b7c2d358
+Create Date: 2026-10-18 20:27:43.160754
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '74bbc865dc14'
+down_revision = 'e1f4b7c2d358'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('standing_queue',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('queued_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('academic_standing',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('semester', sa.String(length=10), nullable=False),
+    sa.Column('term_gpa', sa.Float(), nullable=False),
+    sa.Column('term_credits', sa.Integer(), nullable=False),
+    sa.Column('cumulative_gpa', sa.Float(), nullable=False),
+    sa.Column('cumulative_credits', sa.Integer(), nullable=False),
+    sa.Column('standing', sa.String(length=20), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'semester')
+    )
+    with op.batch_alter_table('academic_standing', schema=None) as batch_op:
+        batch_op.create_index('ix_standing_semester', ['semester', 'standing'], unique=False)
+    # Lần chạy đầu `flask compute-standing` (bảng còn trống) tính cho toàn bộ sinh viên
+
+
+def downgrade():
+    with op.batch_alter_table('academic_standing', schema=None) as batch_op:
+        batch_op.drop_index('ix_standing_semester')
+
+    op.drop_table('academic_standing')
+    op.drop_table('standing_queue')
@@ -0,0 +1,50 @@
+"""add foreign key and filter indexes
+
+Revision ID: 7d3b8e51a4c0
+Revises: 5e7a93d0b6f2
+Create Date: 2026-10-18 20:05:13.402716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3b8e51a4c0'
+down_revision = '5e7a93d0b6f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('enrollment', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_enrollment_course_id'), ['course_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_enrollment_grade'), ['grade'], unique=False)
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_exam_course_id'), ['course_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_exam_date'), ['date'], unique=False)
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_schedule_course_id'), ['course_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_schedule_weekday'), ['weekday'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_student_id'), ['student_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_student_id'))
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedule_weekday'))
+        batch_op.drop_index(batch_op.f('ix_schedule_course_id'))
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_exam_date'))
+        batch_op.drop_index(batch_op.f('ix_exam_course_id'))
+
+    with op.batch_alter_table('enrollment', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_enrollment_grade'))
+        batch_op.drop_index(batch_op.f('ix_enrollment_course_id'))
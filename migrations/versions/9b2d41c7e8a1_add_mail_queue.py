@@ -0,0 +1,45 @@
+"""add mail queue
+
+Revision ID: 9b2d41c7e8a1
+Revises: 3fe5c8750b63
+Create Date: 2026-10-18 09:12:04.512337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2d41c7e8a1'
+down_revision = '3fe5c8750b63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mail_queue',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sa.String(length=120), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('course_name', sa.String(length=120), nullable=True),
+    sa.Column('grade', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('mail_queue', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mail_queue_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_mail_queue_next_attempt_at'), ['next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mail_queue', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mail_queue_next_attempt_at'))
+        batch_op.drop_index(batch_op.f('ix_mail_queue_status'))
+
+    op.drop_table('mail_queue')
@@ -0,0 +1,84 @@
+"""store schedule weekday and start/end as numbers
+
+Revision ID: a6c2f19e4b70
+Revises: 7d3b8e51a4c0
+Create Date: 2026-10-18 22:41:09.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2f19e4b70'
+down_revision = '7d3b8e51a4c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.utils.timeslots import parse_weekday, parse_time_range
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weekday_no', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('start_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('end_minute', sa.Integer(), nullable=True))
+
+    # Chuyển "Thứ Hai" / "07:30 - 09:30" -> 1 / 450, 570; dòng không đọc được để NULL và in ra
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, weekday, time FROM schedule")).all()
+    params, unparsed = [], []
+    for r in rows:
+        day, span = parse_weekday(r.weekday), parse_time_range(r.time)
+        if day is None or span is None:
+            unparsed.append(r)
+        params.append({"id": r.id, "day": day,
+                       "start": span[0] if span else None, "end": span[1] if span else None})
+    if params:
+        bind.execute(sa.text("UPDATE schedule SET weekday_no = :day, start_minute = :start, "
+                             "end_minute = :end WHERE id = :id"), params)
+    for r in unparsed:
+        print(f"⚠️ schedule #{r.id}: không đọc được thứ/giờ ({r.weekday!r}, {r.time!r}) -> cần sửa tay")
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedule_weekday'))
+        batch_op.drop_column('weekday')
+        batch_op.drop_column('time')
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.alter_column('weekday_no', new_column_name='weekday', existing_type=sa.Integer())
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.create_index('ix_schedule_weekday_start', ['weekday', 'start_minute'], unique=False)
+        batch_op.create_index('ix_schedule_room_slot', ['room', 'weekday', 'start_minute'], unique=False)
+
+
+def downgrade():
+    from app.utils.timeslots import WEEKDAY_NAMES, format_minutes
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weekday_text', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('time', sa.String(length=50), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, weekday, start_minute, end_minute FROM schedule")).all()
+    params = [{"id": r.id, "day": WEEKDAY_NAMES.get(r.weekday),
+               "time": f"{format_minutes(r.start_minute)} - {format_minutes(r.end_minute)}"
+               if r.start_minute is not None else None} for r in rows]
+    if params:
+        bind.execute(sa.text("UPDATE schedule SET weekday_text = :day, time = :time WHERE id = :id"),
+                     params)
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.drop_index('ix_schedule_room_slot')
+        batch_op.drop_index('ix_schedule_weekday_start')
+        batch_op.drop_column('end_minute')
+        batch_op.drop_column('start_minute')
+        batch_op.drop_column('weekday')
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.alter_column('weekday_text', new_column_name='weekday',
+                              existing_type=sa.String(length=20))
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_schedule_weekday'), ['weekday'], unique=False)
@@ -0,0 +1,33 @@
+"""add student gpa aggregates
+
+Revision ID: c41f0e6a2d93
+Revises: 9b2d41c7e8a1
+Create Date: 2026-10-18 10:02:47.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f0e6a2d93'
+down_revision = '9b2d41c7e8a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('student_gpa',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('gpa', sa.Float(), nullable=False),
+    sa.Column('total_credits', sa.Integer(), nullable=False),
+    sa.Column('semesters', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+    # Dữ liệu cũ: chạy `flask rebuild-gpa` sau khi nâng cấp
+
+
+def downgrade():
+    op.drop_table('student_gpa')
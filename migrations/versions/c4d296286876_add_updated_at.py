@@ -0,0 +1,36 @@
+"""add updated_at for api validators
+
+Revision ID: c4d296286876
+Revises: 74bbc865dc14
+Create Date: 2026-10-18 20:30:59.484925
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d296286876'
+down_revision = '74bbc865dc14'
+branch_labels = None
+depends_on = None
+
+TABLES = ('student', 'course', 'enrollment', 'exam', 'schedule')
+HAS_CREATED_AT = ('student', 'course', 'enrollment')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Dòng cũ: coi như sửa lần cuối lúc tạo (exam / schedule không có created_at)
+    for table in TABLES:
+        source = 'COALESCE(created_at, CURRENT_TIMESTAMP)' if table in HAS_CREATED_AT else 'CURRENT_TIMESTAMP'
+        op.execute(f"UPDATE {table} SET updated_at = {source}")
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
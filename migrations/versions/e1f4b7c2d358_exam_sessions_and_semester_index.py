@@ -0,0 +1,36 @@
+"""exam start time and enrollment semester index
+
+Revision ID: e1f4b7c2d358
+Revises: a6c2f19e4b70
+Create Date: 2026-10-18 23:37:52.640115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f4b7c2d358'
+down_revision = 'a6c2f19e4b70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('enrollment', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_enrollment_semester'), ['semester'], unique=False)
+
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('start_minute', sa.Integer(), nullable=True))
+        batch_op.drop_index(batch_op.f('ix_exam_date'))
+        batch_op.create_index('ix_exam_date_start', ['date', 'start_minute'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('exam', schema=None) as batch_op:
+        batch_op.drop_index('ix_exam_date_start')
+        batch_op.create_index(batch_op.f('ix_exam_date'), ['date'], unique=False)
+        batch_op.drop_column('start_minute')
+
+    with op.batch_alter_table('enrollment', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_enrollment_semester'))